@@ -1,55 +1,81 @@
 #!/usr/bin/env python3
 """
 Acceptance tests to verify all requirements from the optimization prompt.
+
+Run under pytest (in parallel with pytest-xdist):
+    pytest -n auto acceptance_tests.py
+
+or directly as a script:
+    python acceptance_tests.py
 """
 import sys
 import os
+import functools
+import inspect
+import math
+import tempfile
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(__file__))
 
+from src.models.router import ModelRouter
+from src.services.rag_service import RAGService, format_citations
+from src.services.excalidraw_service import ExcalidrawService
+from src.agents.cost_optimizer import CostOptimizerAgent
+from src.agents.bill_explainer import BillExplainerAgent
+
+# Manifest written next to saved boards by ExcalidrawService
+MANIFEST_NAME = "manifest.json"
+# Credentials cleared for mock mode
+CREDENTIAL_VARS = ['FRIENDLI_TOKEN', 'AWS_ACCESS_KEY_ID', 'AWS_SECRET_ACCESS_KEY']
+
 
-def test_mock_mode():
+def _use_mock_env(monkeypatch):
+    """Clear all credentials and switch AWS data to mock."""
+    for key in CREDENTIAL_VARS:
+        monkeypatch.delenv(key, raising=False)
+    monkeypatch.setenv('USE_MOCK_DATA', 'true')
+
+
+@pytest.fixture
+def mock_env(monkeypatch):
+    """Mock-mode environment for the duration of a test."""
+    _use_mock_env(monkeypatch)
+
+
+def test_mock_mode(mock_env):
     """Test that app works in mock mode without any keys."""
     print("=" * 60)
     print("Test: Mock Mode (No Credentials)")
     print("=" * 60)
     
-    # Clear all credentials
-    for key in ['FRIENDLI_TOKEN', 'AWS_ACCESS_KEY_ID', 'AWS_SECRET_ACCESS_KEY']:
-        if key in os.environ:
-            del os.environ[key]
-    
-    os.environ['USE_MOCK_DATA'] = 'true'
-    
-    from src.models.router import ModelRouter
-    from src.services.rag_service import RAGService
-    from src.services.excalidraw_service import ExcalidrawService
-    from src.agents.cost_optimizer import CostOptimizerAgent
-    from src.agents.bill_explainer import BillExplainerAgent
+    # Credentials are read at construction, so build everything after clearing them
+    router = ModelRouter()
+    rag = RAGService()
+    excal = ExcalidrawService()
     
     # Test router
-    router = ModelRouter()
     response = router.llm_complete("Test")
     assert response['provider'] == 'mock', "Should use mock provider"
     print("✓ Router works in mock mode")
     
     # Test RAG
-    rag = RAGService()
     hits = rag.hybrid_search("AWS", k=3)
     assert len(hits) > 0, "Should return mock results"
     print("✓ RAG works with curated stubs")
     
     # Test Excalidraw
-    excal = ExcalidrawService()
-    diagram = excal.generate_diagram("VPC with Lambda")
-    cfn = excal.board_to_cfn(diagram)
+    cfn = excal.board_to_cfn(excal.generate_diagram("VPC with Lambda"))
     assert "AWSTemplateFormatVersion" in cfn, "Should generate CFN"
     print("✓ Excalidraw works (diagram + CFN conversion)")
     
     # Test Cost Optimizer
-    optimizer = CostOptimizerAgent(router)
-    result = optimizer.analyze_resources()
+    result = CostOptimizerAgent(router).analyze_resources()
     assert result['total'] > 0, "Should find savings"
     print(f"✓ Cost Optimizer works (${result['total']:.2f} savings found)")
     
@@ -63,16 +89,13 @@ def test_mock_mode():
     print()
 
 
-def test_badges_and_ui():
+def test_badges_and_ui(router, cached_complete):
     """Test that badges and UI features work."""
     print("=" * 60)
     print("Test: Badges & UI Features")
     print("=" * 60)
     
-    from src.models.router import ModelRouter
-    
-    router = ModelRouter()
-    response = router.llm_complete("Test")
+    response = cached_complete("Test")
     
     # Check response structure
     assert 'text' in response, "Should have text"
@@ -89,51 +112,43 @@ def test_badges_and_ui():
     print()
 
 
-def test_excalidraw_regeneration():
+def test_excalidraw_regeneration(tmp_path, diagram_and_cfn):
     """Test Excalidraw board versioning and CFN regeneration."""
     print("=" * 60)
     print("Test: Excalidraw Board Versioning & CFN Regen")
     print("=" * 60)
     
-    from src.services.excalidraw_service import ExcalidrawService
-    import json
-    from pathlib import Path
-    
+    # Write boards and manifest under a private directory
     service = ExcalidrawService()
+    service.storage_path = tmp_path
     
-    # Generate and save board
-    diagram = service.generate_diagram("Lambda with S3 and DynamoDB")
+    # Save the shared generated board
+    diagram, cfn = diagram_and_cfn
     result = service.save_board(diagram, tenant="test", session="acceptance")
     
     assert result['success'], "Should save board"
     print("✓ Board saved successfully")
     
     # Check manifest exists
-    manifest_path = Path("./mock_data/diagrams/manifest.json")
-    assert manifest_path.exists(), "Manifest should exist"
+    manifest_path = tmp_path / MANIFEST_NAME
+    assert manifest_path.is_file() and manifest_path.stat().st_size > 0, \
+        "Manifest should exist and be non-empty"
     print("✓ Manifest.json created")
     
-    # Regenerate CFN from board
-    cfn = service.board_to_cfn(diagram)
+    # CFN regenerated from the board
     assert "Resources:" in cfn, "Should have resources section"
     print("✓ CFN regenerated from board")
     
     print()
 
 
-def test_optimizer_rules():
+def test_optimizer_rules(optimizer_result):
     """Test deterministic optimizer rules."""
     print("=" * 60)
     print("Test: Optimizer Deterministic Rules")
     print("=" * 60)
     
-    from src.agents.cost_optimizer import CostOptimizerAgent
-    from src.models.router import ModelRouter
-    
-    router = ModelRouter()
-    optimizer = CostOptimizerAgent(router)
-    
-    result = optimizer.analyze_resources()
+    result = optimizer_result
     findings = result['findings']
     
     # Should have findings
@@ -141,29 +156,24 @@ def test_optimizer_rules():
     print(f"✓ Found {len(findings)} optimization opportunities")
     
     # Should be sorted by savings
-    if len(findings) > 1:
-        for i in range(len(findings) - 1):
-            assert findings[i]['est_savings'] >= findings[i+1]['est_savings'], \
-                "Should be sorted by savings"
+    savings = [f['est_savings'] for f in findings]
+    assert savings == sorted(savings, reverse=True), "Should be sorted by savings"
     print("✓ Findings sorted by impact")
     
     # Check total
-    manual_total = sum(f['est_savings'] for f in findings)
+    manual_total = math.fsum(savings)
     assert abs(result['total'] - manual_total) < 0.01, "Total should match sum"
     print(f"✓ Total savings calculated correctly: ${result['total']:.2f}")
     
     print()
 
 
-def test_citations():
+def test_citations(rag):
     """Test RAG citations formatting."""
     print("=" * 60)
     print("Test: RAG Citations")
     print("=" * 60)
     
-    from src.services.rag_service import RAGService, format_citations
-    
-    rag = RAGService()
     hits = rag.hybrid_search("AWS cost optimization", k=3)
     
     assert len(hits) > 0, "Should have results"
@@ -177,13 +187,50 @@ def test_citations():
     print()
 
 
+def _build_fixtures():
+    """Build the services pytest would provide via conftest.py."""
+    router = ModelRouter()
+    optimizer = CostOptimizerAgent(router)
+    excal = ExcalidrawService()
+    diagram = excal.generate_diagram("VPC with Lambda")
+    return {
+        "router": router,
+        "cached_complete": functools.lru_cache(maxsize=64)(router.llm_complete),
+        "rag": RAGService(),
+        "excal": excal,
+        "diagram_and_cfn": (diagram, excal.board_to_cfn(diagram)),
+        "optimizer": optimizer,
+        "optimizer_result": optimizer.analyze_resources(),
+        "explainer": BillExplainerAgent(router),
+        # main applies the mock environment before building anything
+        "mock_env": None,
+    }
+
+
+def _run_test(test, fixtures):
+    """Call a test with the fixtures named in its signature."""
+    # Each test gets its own directory so concurrent writes never collide
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        args = {
+            name: Path(tmp_dir) if name == "tmp_path" else fixtures[name]
+            for name in inspect.signature(test).parameters
+        }
+        test(**args)
+
+
 def main():
-    """Run all acceptance tests."""
+    """Run all acceptance tests concurrently without pytest."""
     print("\n" + "=" * 60)
     print("NIMBUS COPILOT - ACCEPTANCE TESTS")
     print("=" * 60)
     print()
     
+    # os.environ is process-wide, so change it once before any fixture is
+    # built or test thread started, rather than from inside a running test
+    monkeypatch = pytest.MonkeyPatch()
+    _use_mock_env(monkeypatch)
+    fixtures = _build_fixtures()
+    
     tests = [
         test_mock_mode,
         test_badges_and_ui,
@@ -195,19 +242,23 @@ def main():
     passed = 0
     failed = 0
     
-    for test in tests:
+    with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+        futures = [executor.submit(_run_test, test, fixtures) for test in tests]
+    
+    for future in futures:
         try:
-            test()
+            future.result()
             passed += 1
         except AssertionError as e:
             print(f"✗ Test failed: {e}\n")
             failed += 1
         except Exception as e:
             print(f"✗ Test error: {e}\n")
-            import traceback
             traceback.print_exc()
             failed += 1
     
+    monkeypatch.undo()
+    
     print("=" * 60)
     print(f"RESULTS: {passed} passed, {failed} failed")
     print("=" * 60)
@@ -4,19 +4,16 @@ Your personal AI DevOps team for AWS
 """
 import streamlit as st
 import os
-from dotenv import load_dotenv
-import json
+from pathlib import Path
+from src.utils.badges import render_message_meta
+from src.utils.chat_log import ChatLog
 
-# Import services and agents
-from src.models.router import ModelRouter
-from src.orchestrator import AgentOrchestrator
-from src.services.rag_service import RAGService, get_seed_documents
-from src.services.aws_service import get_aws_service
-from src.services.excalidraw_service import ExcalidrawService
-from src.utils.cloudformation import CloudFormationGenerator
+# Local board storage written by ExcalidrawService
+DIAGRAMS_DIR = Path("./mock_data/diagrams")
+MANIFEST_PATH = DIAGRAMS_DIR / "manifest.json"
 
-# Load environment variables
-load_dotenv()
+# Number of recent chat messages rendered on each rerun; older ones render on demand
+CHAT_WINDOW = int(os.getenv("NIMBUS_CHAT_WINDOW", "20"))
 
 # Page configuration
 st.set_page_config(
@@ -26,108 +23,173 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS
-st.markdown("""
-    <style>
-    .main-header {
-        font-size: 3rem;
-        font-weight: bold;
-        background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        margin-bottom: 0.5rem;
-    }
-    .sub-header {
-        font-size: 1.2rem;
-        color: #666;
-        margin-bottom: 2rem;
-    }
-    .agent-badge {
-        display: inline-block;
-        padding: 0.3rem 0.8rem;
-        border-radius: 20px;
-        font-size: 0.9rem;
-        font-weight: 600;
-        margin: 0.2rem;
-    }
-    .setup-badge { background-color: #e3f2fd; color: #1976d2; }
-    .docs-badge { background-color: #f3e5f5; color: #7b1fa2; }
-    .bills-badge { background-color: #fff3e0; color: #e65100; }
-    .optimize-badge { background-color: #e8f5e9; color: #2e7d32; }
-    .provider-badge {
-        display: inline-block;
-        padding: 0.2rem 0.6rem;
-        border-radius: 15px;
-        font-size: 0.8rem;
-        background-color: #f0f0f0;
-        color: #333;
-        margin-left: 0.5rem;
-    }
-    .latency-badge {
-        display: inline-block;
-        padding: 0.2rem 0.6rem;
-        border-radius: 15px;
-        font-size: 0.8rem;
-        background-color: #e0e0e0;
-        color: #333;
-        margin-left: 0.3rem;
-    }
-    .savings-meter {
-        background: linear-gradient(90deg, #4caf50 0%, #8bc34a 100%);
-        padding: 1rem;
-        border-radius: 10px;
-        color: white;
-        text-align: center;
-        font-size: 1.5rem;
-        font-weight: bold;
-        margin: 1rem 0;
-    }
-    .reasoning-box {
-        background-color: #f5f5f5;
-        padding: 1rem;
-        border-radius: 8px;
-        border-left: 4px solid #667eea;
-        margin: 1rem 0;
-        font-size: 0.9rem;
-    }
-    </style>
-""", unsafe_allow_html=True)
+# Custom CSS, read from disk once and cached until the file changes
+CSS_PATH = Path(__file__).parent / "assets" / "styles.css"
+
+
+@st.cache_data(show_spinner=False)
+def load_css(path: str, mtime_ns: int) -> str:
+    return f"<style>{Path(path).read_text(encoding='utf-8')}</style>"
+
+
+# Re-emitted on every run: Streamlit drops elements a rerun doesn't produce,
+# so gating this on session_state would strip the styles after the first run.
+st.markdown(load_css(str(CSS_PATH), CSS_PATH.stat().st_mtime_ns), unsafe_allow_html=True)
+
+
+# Shared services
+# Cached with st.cache_resource so one instance is shared by every session in
+# the process instead of being rebuilt per session. Imports stay inside the
+# factories so the page shell renders before the heavier modules load.
+@st.cache_resource
+def _get_router():
+    from src.models.router import ModelRouter
+    return ModelRouter()
+
+
+@st.cache_resource
+def _get_rag():
+    from src.services.rag_service import RAGService
+    rag_service = RAGService()
+    if os.getenv("NIMBUS_WARMUP", "true").lower() == "true":
+        # Load the embedding model and open connections before the first query
+        try:
+            rag_service.hybrid_search("warmup", k=1)
+        except Exception as e:
+            print(f"RAG warmup failed: {e}")
+    return rag_service
+
+
+@st.cache_resource
+def _seed_rag():
+    """Seed the shared RAG corpus once per process."""
+    from src.services.rag_service import get_seed_documents
+    rag_service = _get_rag()
+    if rag_service and not rag_service.is_seeded():
+        rag_service.seed_data(get_seed_documents())
+    return True
+
+
+@st.cache_resource
+def _get_orchestrator():
+    from src.orchestrator import AgentOrchestrator
+    return AgentOrchestrator(_get_router(), _get_rag())
+
+
+@st.cache_resource
+def _get_aws_service(use_mock: bool):
+    from src.services.aws_service import get_aws_service
+    return get_aws_service(use_mock)
+
+
+@st.cache_resource
+def _get_executor():
+    """Thread pool for running independent data fetches concurrently."""
+    from concurrent.futures import ThreadPoolExecutor
+    return ThreadPoolExecutor(max_workers=3)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _get_cost_breakdown(use_mock: bool):
+    return _get_aws_service(use_mock).get_cost_breakdown()
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _get_optimization_opportunities(use_mock: bool):
+    """Return (opportunities, total estimated monthly savings)."""
+    opportunities = _get_aws_service(use_mock).get_optimization_opportunities()
+    return opportunities, sum(opp['estimated_savings'] for opp in opportunities)
+
+
+@st.cache_resource
+def _prefetch_cost_breakdown(use_mock: bool):
+    """Warm the cost breakdown cache in the background once per process."""
+    if os.getenv("NIMBUS_WARMUP", "true").lower() == "true":
+        _get_executor().submit(_get_cost_breakdown, use_mock)
+    return True
+
+
+@st.cache_resource
+def _get_excalidraw():
+    from src.services.excalidraw_service import ExcalidrawService
+    return ExcalidrawService()
+
+
+@st.cache_resource
+def _get_cfn_generator():
+    from src.utils.cloudformation import CloudFormationGenerator
+    return CloudFormationGenerator()
+
+
+def _normalize_desc(desc: str, casefold: bool = False) -> str:
+    """Collapse whitespace (and optionally case) so trivial edits share a cache entry."""
+    desc = " ".join(desc.split())
+    return desc.lower() if casefold else desc
+
+
+@st.cache_data(ttl=1800, show_spinner=False)
+def _cached_cfn(desc: str):
+    return _get_cfn_generator().generate_from_description(desc)
+
+
+@st.cache_data(ttl=1800, show_spinner=False)
+def _cached_diagram(desc: str):
+    return _get_excalidraw().generate_diagram(desc)
+
+
+@st.cache_data(ttl=1800, show_spinner=False)
+def _cached_embed_url(desc: str):
+    return _get_excalidraw().get_embed_url(_cached_diagram(desc))
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_citations(query: str, k: int):
+    """Formatted citations for a RAG query, or "" when nothing matches."""
+    from src.services.rag_service import format_citations
+    _seed_rag()
+    hits = _get_rag().hybrid_search(query, k=k)
+    return format_citations(hits) if hits else ""
+
+
+@st.cache_data(show_spinner=False)
+def _load_json_cached(path: str, mtime_ns: int):
+    from src.services.excalidraw_service import load_json
+    return load_json(Path(path))
+
+
+def _load_json_file(path: Path):
+    """Parse a JSON file, reusing the cached parse until the file changes."""
+    return _load_json_cached(str(path), path.stat().st_mtime_ns)
 
 
 # Initialize session state
 def init_session_state():
     """Initialize Streamlit session state."""
     if "model_router" not in st.session_state:
-        st.session_state.model_router = ModelRouter()
+        st.session_state.model_router = _get_router()
     
     if "rag_service" not in st.session_state:
-        st.session_state.rag_service = RAGService()
-        # Seed with initial documents
-        st.session_state.rag_service.seed_data(get_seed_documents())
-    
-    if "orchestrator" not in st.session_state:
-        st.session_state.orchestrator = AgentOrchestrator(
-            st.session_state.model_router,
-            st.session_state.rag_service
-        )
+        # Seeding is deferred to the first RAG query (see get_rag_service)
+        st.session_state.rag_service = _get_rag()
     
     if "aws_service" not in st.session_state:
         use_mock = os.getenv("USE_MOCK_DATA", "true").lower() == "true"
-        st.session_state.aws_service = get_aws_service(use_mock)
-    
-    if "excalidraw_service" not in st.session_state:
-        st.session_state.excalidraw_service = ExcalidrawService()
-    
-    if "cfn_generator" not in st.session_state:
-        st.session_state.cfn_generator = CloudFormationGenerator()
+        st.session_state.aws_service = _get_aws_service(use_mock)
+        _prefetch_cost_breakdown(use_mock)
     
     if "messages" not in st.session_state:
-        st.session_state.messages = []
+        st.session_state.messages = ChatLog()
     
     if "total_savings" not in st.session_state:
         st.session_state.total_savings = 0
 
 
+def get_rag_service():
+    """Return the shared RAG service, seeding it on first use."""
+    _seed_rag()
+    return st.session_state.rag_service
+
+
 def render_header():
     """Render the application header."""
     st.markdown('<div class="main-header">☁️ Nimbus Copilot</div>', unsafe_allow_html=True)
@@ -195,105 +257,40 @@ def render_sidebar():
     return preferred_agent, use_mock
 
 
-def render_agent_badge(agent_name: str):
-    """Render an agent badge."""
-    badge_classes = {
-        "setup": "setup-badge",
-        "docs": "docs-badge",
-        "bills": "bills-badge",
-        "optimize": "optimize-badge"
-    }
-    
-    display_names = {
-        "setup": "🛠️ Setup Buddy",
-        "docs": "📚 Doc Navigator",
-        "bills": "💰 Bill Explainer",
-        "optimize": "📊 Cost Optimizer"
-    }
-    
-    badge_class = badge_classes.get(agent_name, "")
-    display_name = display_names.get(agent_name, agent_name)
-    
-    return f'<span class="agent-badge {badge_class}">{display_name}</span>'
-
-
-def render_metadata_badges(provider: str, latency_ms: float, mode: str = "Live"):
-    """Render provider, latency, and mode badges."""
-    # Determine mode based on provider
-    if provider.lower() == "mock":
-        mode = "Mock"
-    
-    provider_badge = f'<span class="provider-badge">🔌 {provider}</span>'
-    latency_badge = f'<span class="latency-badge">⚡ {latency_ms:.0f}ms</span>'
-    mode_badge = f'<span class="provider-badge">📊 Mode: {mode}</span>'
-    return provider_badge + latency_badge + mode_badge
-
-
-def render_reasoning_trace(reasoning: str):
-    """Render reasoning trace in an expander."""
-    if not reasoning:
-        return ""
-    
-    # Format reasoning as a list if it's a string
-    if isinstance(reasoning, str):
-        reasoning_items = [reasoning]
-    elif isinstance(reasoning, list):
-        reasoning_items = reasoning
-    else:
-        reasoning_items = [str(reasoning)]
-    
-    # Create expander content
-    content = '<div class="reasoning-box">'
-    content += '<strong>💭 Agent Reasoning:</strong><br>'
-    for item in reasoning_items:
-        content += f'• {item}<br>'
-    content += '</div>'
-    
-    return content
+def render_chat_message(messages: ChatLog, index: int):
+    """Render one chat history entry."""
+    role = messages.roles[index]
+    with st.chat_message(role):
+        st.markdown(messages.contents[index])
+        
+        if role == "assistant" and messages.rendered_metas[index]:
+            # Show badges and reasoning trace
+            st.markdown(messages.rendered_metas[index], unsafe_allow_html=True)
 
 
+@st.fragment
 def render_chat_interface(preferred_agent: str):
     """Render the main chat interface."""
     # Get use_mock setting
     use_mock = os.getenv("USE_MOCK_DATA", "true").lower() == "true"
     mode = "Mock" if use_mock else "Live"
     
-    # Display chat messages
-    for message in st.session_state.messages:
-        with st.chat_message(message["role"]):
-            st.markdown(message["content"])
-            
-            if message["role"] == "assistant" and "metadata" in message:
-                metadata = message["metadata"]
-                
-                # Show agent badge
-                st.markdown(
-                    render_agent_badge(metadata.get("agent", "")),
-                    unsafe_allow_html=True
-                )
-                
-                # Show provider, latency, and mode badges
-                st.markdown(
-                    render_metadata_badges(
-                        metadata.get("provider", "Unknown"),
-                        metadata.get("latency_ms", 0),
-                        mode
-                    ),
-                    unsafe_allow_html=True
-                )
-                
-                # Show reasoning trace in expander
-                if "reasoning" in metadata and metadata["reasoning"]:
-                    with st.expander("🔍 Show Reasoning"):
-                        st.markdown(
-                            render_reasoning_trace(metadata["reasoning"]),
-                            unsafe_allow_html=True
-                        )
+    # Display chat messages (metadata HTML is rendered once, when the message is added)
+    messages = st.session_state.messages
+    older_count = max(len(messages) - CHAT_WINDOW, 0)
+    
+    # Older messages stay in session state but are only rendered when asked for
+    if older_count and st.toggle(f"Show older messages ({older_count})", key="show_older_messages"):
+        for index in range(older_count):
+            render_chat_message(messages, index)
+    
+    for index in range(older_count, len(messages)):
+        render_chat_message(messages, index)
     
     # Chat input
     if prompt := st.chat_input("Ask me anything about AWS..."):
         # Add user message to chat
-        st.session_state.messages.append({"role": "user", "content": prompt})
+        st.session_state.messages.append("user", prompt)
         
         with st.chat_message("user"):
             st.markdown(prompt)
@@ -301,46 +298,51 @@ def render_chat_interface(preferred_agent: str):
         # Process with orchestrator
         with st.chat_message("assistant"):
             with st.spinner("Thinking..."):
-                result = st.session_state.orchestrator.process_query(
-                    prompt,
-                    preferred_agent=preferred_agent
-                )
-                
-                # Display response
-                st.markdown(result["response"])
-                
-                # Display metadata
-                st.markdown(
-                    render_agent_badge(result.get("agent", "")),
-                    unsafe_allow_html=True
-                )
-                st.markdown(
-                    render_metadata_badges(
-                        result.get("provider", "Unknown"),
-                        result.get("latency_ms", 0),
-                        mode
-                    ),
-                    unsafe_allow_html=True
-                )
+                # Doc Navigator searches the RAG corpus, so seed it first
+                get_rag_service()
                 
-                # Show reasoning in expander
-                if result.get("reasoning"):
-                    with st.expander("🔍 Show Reasoning"):
-                        st.markdown(
-                            render_reasoning_trace(result.get("reasoning", "")),
-                            unsafe_allow_html=True
-                        )
-                
-                # Add assistant message to chat
-                st.session_state.messages.append({
-                    "role": "assistant",
-                    "content": result["response"],
-                    "metadata": result
-                })
+                # The orchestrator is built on the first chat query, not at session init
+                if "orchestrator" not in st.session_state:
+                    st.session_state.orchestrator = _get_orchestrator()
+            
+            # Display response as it streams in; result is filled when it completes
+            result = {}
+            st.write_stream(st.session_state.orchestrator.process_query_stream(
+                prompt,
+                result,
+                preferred_agent=preferred_agent
+            ))
+            
+            rendered_meta = render_message_meta(
+                result.get("agent", ""),
+                result.get("provider", "Unknown"),
+                result.get("latency_ms", 0),
+                result.get("reasoning", ""),
+                mode
+            )
+            
+            # Display badges and reasoning
+            st.markdown(rendered_meta, unsafe_allow_html=True)
+            
+            # Add assistant message to chat
+            st.session_state.messages.append(
+                "assistant",
+                result["response"],
+                agent=result.get("agent", ""),
+                provider=result.get("provider", "Unknown"),
+                latency_ms=result.get("latency_ms", 0),
+                reasoning=result.get("reasoning", ""),
+                rendered_meta=rendered_meta
+            )
 
 
+@st.fragment
 def render_tools_tab():
     """Render the tools tab with CloudFormation and Excalidraw."""
+    # The Excalidraw service is only needed once this tab renders
+    if "excalidraw_service" not in st.session_state:
+        st.session_state.excalidraw_service = _get_excalidraw()
+    
     col1, col2 = st.columns(2)
     
     with col1:
@@ -356,7 +358,8 @@ def render_tools_tab():
         if st.button("Generate CloudFormation Template"):
             if infra_desc:
                 with st.spinner("Generating template..."):
-                    template = st.session_state.cfn_generator.generate_from_description(infra_desc)
+                    # The description is echoed into the template, so keep its case
+                    template = _cached_cfn(_normalize_desc(infra_desc))
                     
                     st.code(template, language="yaml")
                     
@@ -376,12 +379,8 @@ def render_tools_tab():
         
         if st.button("🔄 Regenerate CFN from Latest Board"):
             # Check if we have a saved board
-            from pathlib import Path
-            manifest_path = Path("./mock_data/diagrams/manifest.json")
-            
-            if manifest_path.exists():
-                with open(manifest_path, 'r') as f:
-                    manifest = json.load(f)
+            if MANIFEST_PATH.is_file():
+                manifest = _load_json_file(MANIFEST_PATH)
                 
                 # Get latest board
                 boards = manifest.get("boards", {})
@@ -391,10 +390,9 @@ def render_tools_tab():
                     latest_file = boards[first_board_key].get("latest_key")
                     
                     if latest_file:
-                        board_path = Path(f"./mock_data/diagrams/{latest_file}")
+                        board_path = DIAGRAMS_DIR / latest_file
                         if board_path.exists():
-                            with open(board_path, 'r') as f:
-                                board = json.load(f)
+                            board = _load_json_file(board_path)
                             
                             # Regenerate CFN
                             cfn_template = st.session_state.excalidraw_service.board_to_cfn(board)
@@ -431,7 +429,9 @@ def render_tools_tab():
         if st.button("Generate Diagram"):
             if arch_desc:
                 with st.spinner("Generating diagram..."):
-                    diagram = st.session_state.excalidraw_service.generate_diagram(arch_desc)
+                    # Component detection is case-insensitive
+                    arch_key = _normalize_desc(arch_desc, casefold=True)
+                    diagram = _cached_diagram(arch_key)
                     
                     # Save the diagram
                     save_result = st.session_state.excalidraw_service.save_board(diagram)
@@ -443,12 +443,12 @@ def render_tools_tab():
                     st.json(diagram, expanded=False)
                     
                     # Excalidraw URL
-                    url = st.session_state.excalidraw_service.get_embed_url(diagram)
+                    url = _cached_embed_url(arch_key)
                     st.markdown(f"### [🎨 Open in Excalidraw]({url})")
                     st.info("Click the link above to edit your diagram in Excalidraw")
                     
                     # Download button
-                    diagram_json = json.dumps(diagram, indent=2)
+                    diagram_json = st.session_state.excalidraw_service.export_to_json_bytes(diagram)
                     st.download_button(
                         label="Download Diagram JSON",
                         data=diagram_json,
@@ -460,24 +460,33 @@ def render_tools_tab():
                 st.warning("Please describe your architecture first")
 
 
+@st.fragment
 def render_cost_analysis_tab():
     """Render the cost analysis tab."""
     st.subheader("💰 Cost Analysis & Optimization")
     
+    use_mock = os.getenv("USE_MOCK_DATA", "true").lower() == "true"
+    
     # Toggle for Live Cost Explorer
     col_toggle1, col_toggle2 = st.columns([3, 1])
     with col_toggle2:
         use_live_ce = st.checkbox("Live Cost Explorer", value=False, help="Use live AWS Cost Explorer data (requires AWS credentials)")
     
+    # Fetch cost data, opportunities and citations concurrently
+    executor = _get_executor()
+    cost_future = executor.submit(_get_cost_breakdown, use_mock)
+    opportunities_future = executor.submit(_get_optimization_opportunities, use_mock)
+    citations_future = executor.submit(_cached_citations, "AWS cost optimization best practices", 3)
+    
     # Get cost data
     if use_live_ce:
         try:
-            cost_data = st.session_state.aws_service.get_cost_breakdown()
+            cost_data = cost_future.result()
         except Exception as e:
             st.warning(f"Failed to get live cost data: {e}. Using mock data.")
-            cost_data = st.session_state.aws_service.get_cost_breakdown()
+            cost_data = _get_cost_breakdown(use_mock)
     else:
-        cost_data = st.session_state.aws_service.get_cost_breakdown()
+        cost_data = cost_future.result()
     
     col1, col2 = st.columns(2)
     
@@ -490,9 +499,7 @@ def render_cost_analysis_tab():
     
     with col2:
         st.markdown("#### Optimization Opportunities")
-        opportunities = st.session_state.aws_service.get_optimization_opportunities()
-        
-        total_savings = sum(opp['estimated_savings'] for opp in opportunities)
+        opportunities, total_savings = opportunities_future.result()
         st.session_state.total_savings = total_savings
         
         st.metric("Potential Monthly Savings", f"${total_savings:.2f}")
@@ -508,16 +515,19 @@ def render_cost_analysis_tab():
     st.markdown("### 📚 Related Documentation")
     
     # Get relevant docs about cost optimization
-    if st.session_state.rag_service:
-        from src.services.rag_service import format_citations
-        hits = st.session_state.rag_service.hybrid_search("AWS cost optimization best practices", k=3)
-        if hits:
-            citations = format_citations(hits)
-            st.markdown(citations)
+    citations = citations_future.result()
+    if citations:
+        st.markdown(citations)
 
 
 def main():
     """Main application entry point."""
+    # Load environment variables once per session, before any service reads them
+    if "_env_loaded" not in st.session_state:
+        from dotenv import load_dotenv
+        load_dotenv()
+        st.session_state._env_loaded = True
+    
     # Initialize
     init_session_state()
     
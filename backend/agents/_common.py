@@ -0,0 +1,11 @@
+"""
+Helpers shared by the backend agents.
+"""
+from typing import Dict, Any
+
+
+def format_context(context: Dict[str, Any]) -> str:
+    """Format a non-empty context dictionary for appending to a prompt."""
+    return "\n\nAdditional Context:\n" + "".join(
+        f"- {key}: {value}\n" for key, value in context.items()
+    )
@@ -1,15 +1,37 @@
 """
 Bill Explainer Agent - Enhanced with cost data analysis.
 """
-from typing import Dict, Any, Optional
+import heapq
+from typing import Dict, Any, Optional, ClassVar
 from backend.utils.model_router import ModelRouter, LLMResponse
 from backend.utils.aws_clients import AWSClients
 from backend.utils.weaviate_client import WeaviateClient
+from backend.utils.executor import IO_EXECUTOR
+from backend.utils.timing import timed
+from backend.agents._common import format_context
+
+
+def _run_timed(name: str, sink: Dict[str, float], fn, *args):
+    """Call fn(*args), recording its duration in sink under name."""
+    with timed(name, sink):
+        return fn(*args)
 
 
 class BillExplainerAgent:
     """Agent specialized in AWS billing analysis and explanation."""
     
+    _SYSTEM_PROMPT: ClassVar[str] = """You are Bill Explainer, an AWS billing and cost analysis expert. Your role is to:
+
+1. Break down AWS bills into understandable components
+2. Explain pricing models for various AWS services
+3. Identify the main cost drivers
+4. Help users understand unexpected charges
+5. Provide context about typical AWS costs
+6. Explain the difference between various charge types (usage, data transfer, storage, etc.)
+
+Always be empathetic and clear. Use simple language to explain complex billing concepts.
+When analyzing costs, focus on actionable insights and help users understand what they're paying for."""
+    
     def __init__(
         self,
         model_router: ModelRouter,
@@ -22,53 +44,59 @@ class BillExplainerAgent:
         self.name = "Bill Explainer"
     
     def get_system_prompt(self) -> str:
-        return """You are Bill Explainer, an AWS billing and cost analysis expert. Your role is to:
-
-1. Break down AWS bills into understandable components
-2. Explain pricing models for various AWS services
-3. Identify the main cost drivers
-4. Help users understand unexpected charges
-5. Provide context about typical AWS costs
-6. Explain the difference between various charge types (usage, data transfer, storage, etc.)
-
-Always be empathetic and clear. Use simple language to explain complex billing concepts.
-When analyzing costs, focus on actionable insights and help users understand what they're paying for."""
+        return self._SYSTEM_PROMPT
     
     def process(self, user_input: str, context: Optional[Dict[str, Any]] = None) -> LLMResponse:
         """Process billing-related queries."""
         
-        # Get cost data
-        cost_data = self.aws_clients.get_cost_data()
-        cost_context = self._format_cost_data(cost_data)
+        timings: Dict[str, float] = {}
         
-        # Search for relevant documentation
-        relevant_docs = ""
-        if self.weaviate_client and self.weaviate_client.is_available():
-            docs = self.weaviate_client.hybrid_search(
-                collection_name="AWSDocs",
-                query=f"{user_input} pricing billing",
-                limit=3
+        with timed("total_ms", timings):
+            # Cost data and pricing docs are independent, so fetch them concurrently
+            cost_future = IO_EXECUTOR.submit(
+                _run_timed, "t_aws_ms", timings, self.aws_clients.get_cost_data
             )
-            if docs:
-                relevant_docs = "\n\nRelevant Pricing Documentation:\n"
-                for i, doc in enumerate(docs, 1):
-                    relevant_docs += f"\n{i}. {doc.get('title', 'AWS Docs')}\n"
-                    relevant_docs += f"   {doc.get('content', '')[:200]}...\n"
+            docs_future = None
+            if self.weaviate_client and self.weaviate_client.is_available():
+                docs_future = IO_EXECUTOR.submit(
+                    _run_timed, "t_search_ms", timings,
+                    self._search_pricing_docs, user_input
+                )
+            
+            cost_context = self._format_cost_data(cost_future.result())
+            relevant_docs = docs_future.result() if docs_future else ""
+            
+            # Build prompt
+            prompt = f"{user_input}\n\n{cost_context}{relevant_docs}"
+            if context:
+                prompt += format_context(context)
+            
+            # Generate response
+            with timed("t_llm_ms", timings):
+                response = self.model_router.llm_complete(
+                    prompt=prompt,
+                    system_prompt=self.get_system_prompt(),
+                    max_tokens=1500,
+                    temperature=0.6
+                )
         
-        # Build prompt
-        prompt = f"{user_input}\n\n{cost_context}{relevant_docs}"
-        if context:
-            prompt += self._format_context(context)
-        
-        # Generate response
-        response = self.model_router.llm_complete(
-            prompt=prompt,
-            system_prompt=self.get_system_prompt(),
-            max_tokens=1500,
-            temperature=0.6
+        response.metadata["timings"] = timings
+        return response
+    
+    def _search_pricing_docs(self, user_input: str) -> str:
+        """Search Weaviate for pricing docs and format them for the prompt."""
+        docs = self.weaviate_client.hybrid_search(
+            collection_name="AWSDocs",
+            query=f"{user_input} pricing billing",
+            limit=3
         )
+        if not docs:
+            return ""
         
-        return response
+        return "\n\nRelevant Pricing Documentation:\n" + "".join(
+            f"\n{i}. {doc.get('title', 'AWS Docs')}\n   {doc.get('content', '')[:200]}...\n"
+            for i, doc in enumerate(docs, 1)
+        )
     
     def explain_bill(self) -> LLMResponse:
         """Explain the current AWS bill."""
@@ -95,28 +123,23 @@ Provide:
     
     def _format_cost_data(self, cost_data: Dict[str, Any]) -> str:
         """Format cost data into readable string."""
-        formatted = f"Current AWS Costs:\n"
-        formatted += f"Total: ${cost_data.get('total_cost', 0):.2f}\n\n"
-        formatted += "Breakdown by Service:\n"
+        parts = [
+            "Current AWS Costs:\n",
+            f"Total: ${cost_data.get('total_cost', 0):.2f}\n\n",
+            "Breakdown by Service:\n"
+        ]
         
         services = cost_data.get('cost_by_service', {})
-        sorted_services = sorted(services.items(), key=lambda x: x[1], reverse=True)
+        top_services = heapq.nlargest(10, services.items(), key=lambda x: x[1])  # Top 10 services
+        # A zero total (no spend) would otherwise divide by zero
+        scale = 100.0 / (cost_data.get('total_cost') or 1)
         
-        for service, cost in sorted_services[:10]:  # Top 10 services
-            percentage = (cost / cost_data.get('total_cost', 1)) * 100
-            formatted += f"  - {service}: ${cost:.2f} ({percentage:.1f}%)\n"
+        parts.extend(
+            f"  - {service}: ${cost:.2f} ({cost * scale:.1f}%)\n"
+            for service, cost in top_services
+        )
         
         period = cost_data.get('period', {})
-        formatted += f"\nPeriod: {period.get('start', 'N/A')} to {period.get('end', 'N/A')}\n"
-        
-        return formatted
-    
-    def _format_context(self, context: Dict[str, Any]) -> str:
-        """Format context dictionary into a string."""
-        if not context:
-            return ""
+        parts.append(f"\nPeriod: {period.get('start', 'N/A')} to {period.get('end', 'N/A')}\n")
         
-        formatted = "\n\nAdditional Context:\n"
-        for key, value in context.items():
-            formatted += f"- {key}: {value}\n"
-        return formatted
+        return "".join(parts)
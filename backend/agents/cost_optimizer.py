@@ -1,25 +1,41 @@
 """
 Cost Optimizer Agent - Enhanced with AWS resource analysis.
 """
-from typing import Dict, Any, Optional, List
+import hashlib
+import time
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import Dict, Any, Optional, List, Tuple, ClassVar, TYPE_CHECKING
 from backend.utils.model_router import ModelRouter, LLMResponse
-from backend.utils.aws_clients import AWSClients
+from backend.utils.executor import IO_EXECUTOR
+from backend.agents._common import format_context
+
+if TYPE_CHECKING:
+    from backend.utils.aws_clients import AWSClients
+    from backend.utils.semantic_cache import SemanticCache
+
+# Seconds gathered AWS resource data is reused before being fetched again
+OPTIMIZATION_DATA_TTL = 120
+
+
+@dataclass(frozen=True)
+class Savings:
+    """Potential monthly savings by category."""
+    ec2: float
+    snapshot: float
+    s3: float
+    total: float
 
 
 class CostOptimizerAgent:
     """Agent specialized in AWS cost optimization."""
     
-    def __init__(
-        self,
-        model_router: ModelRouter,
-        aws_clients: Optional[AWSClients] = None
-    ):
-        self.model_router = model_router
-        self.aws_clients = aws_clients or AWSClients()
-        self.name = "Cost Optimizer"
+    __slots__ = (
+        'model_router', 'aws_clients', 'semantic_cache', 'name',
+        '_data_cache', '_data_hash'
+    )
     
-    def get_system_prompt(self) -> str:
-        return """You are Cost Optimizer, an AWS cost optimization expert. Your role is to:
+    _SYSTEM_PROMPT: ClassVar[str] = """You are Cost Optimizer, an AWS cost optimization expert. Your role is to:
 
 1. Identify specific opportunities to reduce AWS costs
 2. Quantify potential savings for each optimization
@@ -31,160 +47,240 @@ class CostOptimizerAgent:
 Be specific with numbers and recommendations. Focus on practical optimizations that users can implement quickly.
 Always explain why each optimization will save money and any potential trade-offs."""
     
+    # Static instructions first so the prompt prefix stays byte-identical across calls
+    _ANALYZE_TEMPLATE: ClassVar[str] = """Analyze the cost optimization opportunities in the data below and provide specific recommendations.
+
+For each category:
+1. Prioritize by impact (savings amount)
+2. Provide step-by-step instructions to implement
+3. Mention any risks or considerations
+4. Estimate implementation time
+
+Format your response clearly with sections for each optimization type.
+
+Current data:
+{context}
+Total Potential Monthly Savings: ${total:.2f}"""
+    
+    # Context used when discovery finds nothing to optimize
+    _EMPTY_TEMPLATE: ClassVar[str] = """Current AWS Environment Analysis:
+
+Total Monthly Cost: ${total_cost:.2f}
+
+No optimization opportunities found.
+"""
+    
+    def __init__(
+        self,
+        model_router: ModelRouter,
+        aws_clients: Optional['AWSClients'] = None,
+        semantic_cache: Optional['SemanticCache'] = None
+    ):
+        """
+        Args:
+            model_router: Router used for LLM calls
+            aws_clients: AWS clients; discovery calls are expected to paginate
+                and filter server-side (see AWSClients.list_idle_ec2_instances
+                and list_old_snapshots)
+            semantic_cache: Optional cache for repeated LLM prompts
+        """
+        self.model_router = model_router
+        if aws_clients is None:
+            from backend.utils.aws_clients import AWSClients
+            aws_clients = AWSClients()
+        self.aws_clients = aws_clients
+        self.semantic_cache = semantic_cache
+        self.name = "Cost Optimizer"
+        self._data_cache: Optional[Tuple[float, tuple]] = None
+        # Hash of the last gathered data, so cached answers never outlive it
+        self._data_hash = ""
+    
+    def _gather_optimization_data(self) -> tuple:
+        """
+        Return (idle_instances, old_snapshots, s3_opportunities, cost_data, savings).
+        
+        The four AWS calls hit independent services and run concurrently.
+        Savings are computed once per fetch. Results are cached for
+        OPTIMIZATION_DATA_TTL seconds.
+        """
+        if self._data_cache and self._data_cache[0] > time.monotonic():
+            return self._data_cache[1]
+        
+        futures = [
+            IO_EXECUTOR.submit(call) for call in (
+                self.aws_clients.list_idle_ec2_instances,
+                self.aws_clients.list_old_snapshots,
+                self.aws_clients.analyze_s3_lifecycle_opportunities,
+                self.aws_clients.get_cost_data
+            )
+        ]
+        data = tuple(future.result() for future in futures)
+        self._data_hash = hashlib.sha256(repr(data).encode()).hexdigest()
+        data += (self._compute_savings(*data[:3]),)
+        self._data_cache = (time.monotonic() + OPTIMIZATION_DATA_TTL, data)
+        return data
+    
+    def get_system_prompt(self) -> str:
+        return self._SYSTEM_PROMPT
+    
     def process(self, user_input: str, context: Optional[Dict[str, Any]] = None) -> LLMResponse:
         """Process cost optimization queries."""
+        prompt = self._build_process_prompt(user_input, context)
+        
+        # Generate response
+        response = self._complete(prompt, max_tokens=1500, temperature=0.6)
+        
+        return response
+    
+    def analyze_optimizations(self) -> LLMResponse:
+        """Analyze and provide comprehensive cost optimization recommendations."""
+        prompt = self._build_analyze_prompt()
+        
+        response = self._complete(prompt, max_tokens=2000, temperature=0.5)
         
+        return response
+    
+    def _build_process_prompt(self, user_input: str, context: Optional[Dict[str, Any]]) -> str:
+        """Build the prompt for a cost optimization query."""
         # Gather optimization data
-        idle_instances = self.aws_clients.list_idle_ec2_instances()
-        old_snapshots = self.aws_clients.list_old_snapshots()
-        s3_opportunities = self.aws_clients.analyze_s3_lifecycle_opportunities()
-        cost_data = self.aws_clients.get_cost_data()
+        idle_instances, old_snapshots, s3_opportunities, cost_data, savings = self._gather_optimization_data()
         
         # Format optimization context
         optimization_context = self._format_optimization_data(
-            idle_instances, old_snapshots, s3_opportunities, cost_data
+            idle_instances, old_snapshots, s3_opportunities, cost_data, savings
         )
         
         # Build prompt
         prompt = f"{user_input}\n\n{optimization_context}"
         if context:
-            prompt += self._format_context(context)
-        
-        # Generate response
-        response = self.model_router.llm_complete(
-            prompt=prompt,
-            system_prompt=self.get_system_prompt(),
-            max_tokens=1500,
-            temperature=0.6
-        )
-        
-        return response
+            prompt += format_context(context)
+        return prompt
     
-    def analyze_optimizations(self) -> LLMResponse:
-        """Analyze and provide comprehensive cost optimization recommendations."""
-        
+    def _build_analyze_prompt(self) -> str:
+        """Build the prompt for a full optimization analysis."""
         # Gather all optimization data
-        idle_instances = self.aws_clients.list_idle_ec2_instances()
-        old_snapshots = self.aws_clients.list_old_snapshots()
-        s3_opportunities = self.aws_clients.analyze_s3_lifecycle_opportunities()
-        cost_data = self.aws_clients.get_cost_data()
-        
-        # Calculate total savings
-        ec2_savings = sum(inst.get('monthly_cost', 0) for inst in idle_instances)
-        snapshot_savings = sum(snap.get('monthly_cost', 0) for snap in old_snapshots)
-        s3_savings = sum(opp.get('estimated_savings', 0) for opp in s3_opportunities)
-        total_savings = ec2_savings + snapshot_savings + s3_savings
-        
-        prompt = f"""Analyze these cost optimization opportunities and provide specific recommendations:
-
-{self._format_optimization_data(idle_instances, old_snapshots, s3_opportunities, cost_data)}
-
-Total Potential Monthly Savings: ${total_savings:.2f}
-
-For each category:
-1. Prioritize by impact (savings amount)
-2. Provide step-by-step instructions to implement
-3. Mention any risks or considerations
-4. Estimate implementation time
-
-Format your response clearly with sections for each optimization type."""
+        idle_instances, old_snapshots, s3_opportunities, cost_data, savings = self._gather_optimization_data()
         
-        response = self.model_router.llm_complete(
-            prompt=prompt,
-            system_prompt=self.get_system_prompt(),
-            max_tokens=2000,
-            temperature=0.5
+        return self._ANALYZE_TEMPLATE.format(
+            context=self._format_optimization_data(
+                idle_instances, old_snapshots, s3_opportunities, cost_data, savings
+            ),
+            total=savings.total
         )
+    
+    def _complete(self, prompt: str, max_tokens: int, temperature: float) -> LLMResponse:
+        """Call the LLM, going through the semantic cache when one is set."""
+        def compute() -> LLMResponse:
+            return self.model_router.llm_complete(
+                prompt=prompt,
+                system_prompt=self.get_system_prompt(),
+                max_tokens=max_tokens,
+                temperature=temperature
+            )
         
-        return response
+        if not self.semantic_cache:
+            return compute()
+        return self.semantic_cache.get_or_compute(
+            prompt,
+            self.get_system_prompt(),
+            compute,
+            scope=f"{max_tokens}:{temperature}:{self._data_hash}"
+        )
     
     def _format_optimization_data(
         self,
         idle_instances: List[Dict],
         old_snapshots: List[Dict],
         s3_opportunities: List[Dict],
-        cost_data: Dict
+        cost_data: Dict,
+        savings: Optional[Savings] = None
     ) -> str:
         """Format optimization data into readable string."""
-        formatted = "Current AWS Environment Analysis:\n\n"
+        if not (idle_instances or old_snapshots or s3_opportunities):
+            return self._EMPTY_TEMPLATE.format(total_cost=cost_data.get('total_cost', 0))
+        
+        if savings is None:
+            savings = self._compute_savings(idle_instances, old_snapshots, s3_opportunities)
         
-        # Cost summary
-        formatted += f"Total Monthly Cost: ${cost_data.get('total_cost', 0):.2f}\n\n"
+        parts = [
+            "Current AWS Environment Analysis:\n\n",
+            # Cost summary
+            f"Total Monthly Cost: ${cost_data.get('total_cost', 0):.2f}\n\n"
+        ]
         
         # Idle EC2 instances
         if idle_instances:
-            ec2_savings = sum(inst.get('monthly_cost', 0) for inst in idle_instances)
-            formatted += f"1. IDLE EC2 INSTANCES ({len(idle_instances)} found)\n"
-            formatted += f"   Potential savings: ${ec2_savings:.2f}/month\n"
+            parts.append(f"1. IDLE EC2 INSTANCES ({len(idle_instances)} found)\n")
+            parts.append(f"   Potential savings: ${savings.ec2:.2f}/month\n")
             for inst in idle_instances[:5]:  # Show top 5
-                formatted += f"   - {inst['instance_id']} ({inst['instance_type']}): "
-                formatted += f"CPU {inst.get('cpu_utilization', 0):.1f}% → ${inst.get('monthly_cost', 0):.2f}/mo\n"
+                parts.append(
+                    f"   - {inst['instance_id']} ({inst['instance_type']}): "
+                    f"CPU {inst.get('cpu_utilization', 0):.1f}% → ${inst.get('monthly_cost', 0):.2f}/mo\n"
+                )
             if len(idle_instances) > 5:
-                formatted += f"   ... and {len(idle_instances) - 5} more\n"
-            formatted += "\n"
+                parts.append(f"   ... and {len(idle_instances) - 5} more\n")
+            parts.append("\n")
         
         # Old snapshots
         if old_snapshots:
-            snapshot_savings = sum(snap.get('monthly_cost', 0) for snap in old_snapshots)
-            total_size = sum(snap.get('volume_size', 0) for snap in old_snapshots)
-            formatted += f"2. OLD EBS SNAPSHOTS ({len(old_snapshots)} found)\n"
-            formatted += f"   Total size: {total_size} GB\n"
-            formatted += f"   Potential savings: ${snapshot_savings:.2f}/month\n"
+            total_size = sum(map(itemgetter('volume_size'), old_snapshots))
+            parts.append(f"2. OLD EBS SNAPSHOTS ({len(old_snapshots)} found)\n")
+            parts.append(f"   Total size: {total_size} GB\n")
+            parts.append(f"   Potential savings: ${savings.snapshot:.2f}/month\n")
             for snap in old_snapshots[:3]:
-                formatted += f"   - {snap['snapshot_id']}: {snap.get('volume_size', 0)} GB, "
-                formatted += f"created {snap.get('start_time', 'N/A')}\n"
-            formatted += "\n"
+                parts.append(
+                    f"   - {snap['snapshot_id']}: {snap['volume_size']} GB, "
+                    f"created {snap.get('start_time', 'N/A')}\n"
+                )
+            parts.append("\n")
         
         # S3 opportunities
         if s3_opportunities:
-            s3_savings = sum(opp.get('estimated_savings', 0) for opp in s3_opportunities)
-            formatted += f"3. S3 LIFECYCLE OPPORTUNITIES ({len(s3_opportunities)} found)\n"
-            formatted += f"   Potential savings: ${s3_savings:.2f}/month\n"
-            for opp in s3_opportunities:
-                formatted += f"   - {opp['bucket_name']}: {opp['recommendation']}\n"
-            formatted += "\n"
+            parts.append(f"3. S3 LIFECYCLE OPPORTUNITIES ({len(s3_opportunities)} found)\n")
+            parts.append(f"   Potential savings: ${savings.s3:.2f}/month\n")
+            parts.extend(
+                f"   - {opp['bucket_name']}: {opp['recommendation']}\n"
+                for opp in s3_opportunities
+            )
+            parts.append("\n")
         
         # Total
-        total = (sum(inst.get('monthly_cost', 0) for inst in idle_instances) +
-                 sum(snap.get('monthly_cost', 0) for snap in old_snapshots) +
-                 sum(opp.get('estimated_savings', 0) for opp in s3_opportunities))
-        formatted += f"TOTAL POTENTIAL SAVINGS: ${total:.2f}/month (${total * 12:.2f}/year)\n"
+        parts.append(
+            f"TOTAL POTENTIAL SAVINGS: ${savings.total:.2f}/month (${savings.total * 12:.2f}/year)\n"
+        )
         
-        return formatted
+        return "".join(parts)
+    
+    def _compute_savings(
+        self,
+        idle_instances: List[Dict],
+        old_snapshots: List[Dict],
+        s3_opportunities: List[Dict]
+    ) -> Savings:
+        """Sum potential monthly savings per category."""
+        # AWSClients always populates these keys, so no per-item .get default
+        ec2 = sum(map(itemgetter('monthly_cost'), idle_instances))
+        snapshot = sum(map(itemgetter('monthly_cost'), old_snapshots))
+        s3 = sum(map(itemgetter('estimated_savings'), s3_opportunities))
+        return Savings(ec2=ec2, snapshot=snapshot, s3=s3, total=ec2 + snapshot + s3)
     
     def get_savings_summary(self) -> Dict[str, Any]:
         """Get a summary of potential savings."""
-        idle_instances = self.aws_clients.list_idle_ec2_instances()
-        old_snapshots = self.aws_clients.list_old_snapshots()
-        s3_opportunities = self.aws_clients.analyze_s3_lifecycle_opportunities()
-        
-        ec2_savings = sum(inst.get('monthly_cost', 0) for inst in idle_instances)
-        snapshot_savings = sum(snap.get('monthly_cost', 0) for snap in old_snapshots)
-        s3_savings = sum(opp.get('estimated_savings', 0) for opp in s3_opportunities)
+        idle_instances, old_snapshots, s3_opportunities, _, savings = self._gather_optimization_data()
         
         return {
             'ec2_idle_instances': {
                 'count': len(idle_instances),
-                'monthly_savings': ec2_savings
+                'monthly_savings': savings.ec2
             },
             'old_snapshots': {
                 'count': len(old_snapshots),
-                'monthly_savings': snapshot_savings
+                'monthly_savings': savings.snapshot
             },
             's3_lifecycle': {
                 'count': len(s3_opportunities),
-                'monthly_savings': s3_savings
+                'monthly_savings': savings.s3
             },
-            'total_monthly_savings': ec2_savings + snapshot_savings + s3_savings,
-            'total_annual_savings': (ec2_savings + snapshot_savings + s3_savings) * 12
+            'total_monthly_savings': savings.total,
+            'total_annual_savings': savings.total * 12
         }
-    
-    def _format_context(self, context: Dict[str, Any]) -> str:
-        """Format context dictionary into a string."""
-        if not context:
-            return ""
-        
-        formatted = "\n\nAdditional Context:\n"
-        for key, value in context.items():
-            formatted += f"- {key}: {value}\n"
-        return formatted
@@ -1,25 +1,21 @@
 """
 Doc Navigator Agent - Enhanced with Weaviate semantic search.
 """
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, ClassVar, TYPE_CHECKING
 from backend.utils.model_router import ModelRouter, LLMResponse
-from backend.utils.weaviate_client import WeaviateClient
+from backend.agents._common import format_context
+
+if TYPE_CHECKING:
+    from backend.utils.weaviate_client import WeaviateClient
+    from backend.utils.semantic_cache import SemanticCache
 
 
 class DocNavigatorAgent:
     """Agent specialized in navigating AWS documentation using RAG."""
     
-    def __init__(
-        self,
-        model_router: ModelRouter,
-        weaviate_client: Optional[WeaviateClient] = None
-    ):
-        self.model_router = model_router
-        self.weaviate_client = weaviate_client or WeaviateClient()
-        self.name = "Doc Navigator"
+    __slots__ = ('model_router', 'weaviate_client', 'semantic_cache', 'name')
     
-    def get_system_prompt(self) -> str:
-        return """You are Doc Navigator, an expert at helping users find and understand AWS documentation. Your role is to:
+    _SYSTEM_PROMPT: ClassVar[str] = """You are Doc Navigator, an expert at helping users find and understand AWS documentation. Your role is to:
 
 1. Search AWS documentation for relevant information
 2. Explain complex AWS concepts in simple, clear terms
@@ -32,9 +28,62 @@ class DocNavigatorAgent:
 Be concise, accurate, and helpful. When you reference documentation, be specific about the source.
 If you use information from the documentation search results, cite it appropriately."""
     
+    _COMPARE_INSTRUCTIONS: ClassVar[str] = """Compare the two AWS services below using their documentation.
+
+Provide a clear comparison covering:
+1. Primary use cases for each
+2. Key differences
+3. When to choose one over the other
+4. Pricing considerations
+5. Integration with other AWS services"""
+    
+    _EXPLAIN_INSTRUCTIONS: ClassVar[str] = """Explain the AWS concept below in simple terms, using the documentation provided.
+
+Include:
+1. What it is (simple definition)
+2. Why it's useful
+3. Common use cases
+4. How it works (high-level)
+5. Best practices
+6. Related AWS services
+
+Make it easy to understand for someone new to AWS."""
+    
+    # Favor vector search slightly
+    _SEARCH_ALPHA: ClassVar[float] = 0.7
+    # Only the precomputed snippet is fetched, not the full document content
+    _SEARCH_PROPERTIES: ClassVar[List[str]] = ["title", "service", "content_snippet", "url"]
+    
+    _UNAVAILABLE_NOTE: ClassVar[str] = "(Using built-in knowledge - Weaviate not available)"
+    
+    def __init__(
+        self,
+        model_router: ModelRouter,
+        weaviate_client: Optional['WeaviateClient'] = None,
+        semantic_cache: Optional['SemanticCache'] = None
+    ):
+        self.model_router = model_router
+        if weaviate_client is None:
+            from backend.utils.weaviate_client import WeaviateClient
+            weaviate_client = WeaviateClient()
+        self.weaviate_client = weaviate_client
+        self.semantic_cache = semantic_cache
+        self.name = "Doc Navigator"
+    
+    def get_system_prompt(self) -> str:
+        return self._SYSTEM_PROMPT
+    
     def process(self, user_input: str, context: Optional[Dict[str, Any]] = None) -> LLMResponse:
         """Process documentation queries with RAG."""
+        prompt = self._build_process_prompt(user_input, context)
+        
+        # Generate response
+        response = self._complete(prompt, max_tokens=1500, temperature=0.5)
         
+        return response
+    
+    def _build_process_prompt(self, user_input: str, context: Optional[Dict[str, Any]]) -> str:
+        """Build the prompt for a documentation query."""
         # Perform hybrid search (vector + keyword)
         relevant_docs = self._search_documentation(user_input)
         
@@ -44,59 +93,41 @@ If you use information from the documentation search results, cite it appropriat
             prompt += "\n\n" + relevant_docs
         
         if context:
-            prompt += self._format_context(context)
-        
-        # Generate response
-        response = self.model_router.llm_complete(
-            prompt=prompt,
-            system_prompt=self.get_system_prompt(),
-            max_tokens=1500,
-            temperature=0.5
-        )
-        
-        return response
+            prompt += format_context(context)
+        return prompt
     
     def search_docs(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
         """Search for relevant documentation."""
-        if self.weaviate_client.is_available():
-            return self.weaviate_client.hybrid_search(
-                collection_name="AWSDocs",
-                query=query,
-                limit=limit
-            )
-        else:
-            # Return mock results
-            return self.weaviate_client._get_mock_results(query, limit)
+        # hybrid_search already falls back to mock results when Weaviate is unavailable
+        return self._do_search(query, limit)
     
     def compare_services(self, service1: str, service2: str) -> LLMResponse:
         """Compare two AWS services."""
         
-        # Search for docs on both services
-        docs1 = self._search_documentation(service1, limit=3)
-        docs2 = self._search_documentation(service2, limit=3)
-        
-        prompt = f"""Compare {service1} and {service2}:
-
-Documentation for {service1}:
-{docs1}
-
-Documentation for {service2}:
-{docs2}
-
-Provide a clear comparison covering:
-1. Primary use cases for each
-2. Key differences
-3. When to choose one over the other
-4. Pricing considerations
-5. Integration with other AWS services"""
-        
-        response = self.model_router.llm_complete(
-            prompt=prompt,
-            system_prompt=self.get_system_prompt(),
-            max_tokens=1500,
-            temperature=0.6
+        # Search for docs on both services in one batched call: the searches
+        # run concurrently and a repeated service name is only searched once
+        if self.weaviate_client.is_available():
+            results = self.weaviate_client.hybrid_search_batch(
+                collection_name="AWSDocs",
+                queries=[service1, service2],
+                limit=3,
+                alpha=self._SEARCH_ALPHA,
+                properties=self._SEARCH_PROPERTIES
+            )
+            docs1, docs2 = (self._format_docs(docs) for docs in results)
+        else:
+            docs1 = docs2 = self._UNAVAILABLE_NOTE
+        
+        # Static instructions first so the prompt prefix stays cacheable
+        prompt = (
+            f"{self._COMPARE_INSTRUCTIONS}\n\n"
+            f"Services: {service1} and {service2}\n\n"
+            f"Documentation for {service1}:\n{docs1}\n\n"
+            f"Documentation for {service2}:\n{docs2}"
         )
         
+        response = self._complete(prompt, max_tokens=1500, temperature=0.6)
+        
         return response
     
     def explain_concept(self, concept: str) -> LLMResponse:
@@ -105,61 +136,75 @@ Provide a clear comparison covering:
         # Search for relevant documentation
         relevant_docs = self._search_documentation(concept, limit=5)
         
-        prompt = f"""Explain this AWS concept in simple terms: {concept}
-
-{relevant_docs}
-
-Include:
-1. What it is (simple definition)
-2. Why it's useful
-3. Common use cases
-4. How it works (high-level)
-5. Best practices
-6. Related AWS services
-
-Make it easy to understand for someone new to AWS."""
-        
-        response = self.model_router.llm_complete(
-            prompt=prompt,
-            system_prompt=self.get_system_prompt(),
-            max_tokens=1500,
-            temperature=0.6
+        prompt = (
+            f"{self._EXPLAIN_INSTRUCTIONS}\n\n"
+            f"Concept: {concept}\n\n"
+            f"{relevant_docs}"
         )
         
+        response = self._complete(prompt, max_tokens=1500, temperature=0.6)
+        
         return response
     
+    def _complete(self, prompt: str, max_tokens: int, temperature: float) -> LLMResponse:
+        """Call the LLM, going through the semantic cache when one is set."""
+        def compute() -> LLMResponse:
+            return self.model_router.llm_complete(
+                prompt=prompt,
+                system_prompt=self.get_system_prompt(),
+                max_tokens=max_tokens,
+                temperature=temperature
+            )
+        
+        if not self.semantic_cache:
+            return compute()
+        return self.semantic_cache.get_or_compute(
+            prompt,
+            self.get_system_prompt(),
+            compute,
+            scope=f"{max_tokens}:{temperature}"
+        )
+    
     def _search_documentation(self, query: str, limit: int = 5) -> str:
         """Search documentation and format results."""
         if not self.weaviate_client.is_available():
-            return "(Using built-in knowledge - Weaviate not available)"
+            return self._UNAVAILABLE_NOTE
         
-        docs = self.weaviate_client.hybrid_search(
+        return self._format_docs(self._do_search(query, limit))
+    
+    def _do_search(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Hybrid search over AWSDocs.
+        
+        Every search goes through here with the same alpha, so repeated
+        queries are served from WeaviateClient's result cache.
+        """
+        return self.weaviate_client.hybrid_search(
             collection_name="AWSDocs",
             query=query,
             limit=limit,
-            alpha=0.7  # Favor vector search slightly
+            alpha=self._SEARCH_ALPHA,
+            properties=self._SEARCH_PROPERTIES
         )
-        
+    
+    def _format_docs(self, docs: List[Dict[str, Any]]) -> str:
+        """Format search results for the prompt."""
         if not docs:
             return "(No specific documentation found, using general knowledge)"
         
-        formatted = "Relevant AWS Documentation:\n\n"
+        from backend.utils.weaviate_client import make_snippet
+        
+        parts = ["Relevant AWS Documentation:\n\n"]
         for i, doc in enumerate(docs, 1):
-            formatted += f"{i}. **{doc.get('title', 'AWS Documentation')}**\n"
-            formatted += f"   Service: {doc.get('service', 'AWS')}\n"
-            formatted += f"   {doc.get('content', '')[:400]}...\n"
-            if doc.get('url'):
-                formatted += f"   Source: {doc['url']}\n"
-            formatted += "\n"
-        
-        return formatted
-    
-    def _format_context(self, context: Dict[str, Any]) -> str:
-        """Format context dictionary into a string."""
-        if not context:
-            return ""
-        
-        formatted = "\n\nAdditional Context:\n"
-        for key, value in context.items():
-            formatted += f"- {key}: {value}\n"
-        return formatted
+            # Mock results and documents seeded before content_snippet existed
+            # only carry the full content
+            snippet = doc.get('content_snippet') or make_snippet(doc.get('content', ''))
+            source = f"   Source: {doc['url']}\n" if doc.get('url') else ""
+            parts.append(
+                f"{i}. **{doc.get('title', 'AWS Documentation')}**\n"
+                f"   Service: {doc.get('service', 'AWS')}\n"
+                f"   {snippet}\n"
+                f"{source}\n"
+            )
+        
+        return "".join(parts)
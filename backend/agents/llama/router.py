@@ -1,8 +1,13 @@
 """
 LlamaIndex Agent Router using AgentWorkflow for multi-agent orchestration.
 """
+import functools
+import hashlib
 import os
-from typing import Dict, Any, Optional, List
+import re
+import time
+from collections import deque
+from typing import Dict, Any, Optional, List, Callable, Tuple, ClassVar
 from dataclasses import dataclass
 
 # LlamaIndex imports (optional - graceful degradation)
@@ -30,9 +35,48 @@ except ImportError:
 from backend.utils.model_router import ModelRouter, LLMResponse
 from backend.utils.weaviate_client import WeaviateClient
 from backend.utils.aws_clients import AWSClients
+from backend.utils.semantic_cache import SemanticCache
+from backend.utils.executor import IO_EXECUTOR
 
 
-@dataclass
+# Set NIMBUS_TRACE=false to skip building reasoning trace entries
+TRACING_ENABLED = os.getenv("NIMBUS_TRACE", "true").lower() == "true"
+# Most steps kept in a reasoning trace, and longest query text stored in one
+TRACE_MAX_STEPS = 64
+TRACE_QUERY_CHARS = 200
+
+# Routing keywords in priority order; the first category with a match wins
+_ROUTES = [
+    ("optimize", "Query contains cost optimization keywords", [
+        "optimize", "reduce cost", "save money", "cheaper",
+        "expensive", "savings", "cut cost", "idle", "waste"
+    ]),
+    ("setup", "Query related to infrastructure setup", [
+        "setup", "deploy", "create", "infrastructure", "cloudformation",
+        "provision", "launch", "configure", "architecture"
+    ]),
+    ("bills", "Query about billing and charges", [
+        "bill", "billing", "charge", "invoice", "cost breakdown",
+        "why am i charged", "understand my bill", "spending"
+    ])
+]
+_ROUTE_PATTERNS = [
+    (agent, reason, re.compile("|".join(map(re.escape, keywords))))
+    for agent, reason, keywords in _ROUTES
+]
+
+
+@functools.lru_cache(maxsize=2048)
+def _classify_query(query_lower: str) -> Tuple[str, str]:
+    """Return (agent, reason) for a lowercased query."""
+    for agent, reason, pattern in _ROUTE_PATTERNS:
+        if pattern.search(query_lower):
+            return agent, reason
+    # Documentation is the default
+    return "docs", "General documentation query"
+
+
+@dataclass(frozen=True)
 class AgentResponse:
     """Response from agent with reasoning trace."""
     response: str
@@ -52,15 +96,42 @@ class LlamaAgentRouter:
     Gracefully degrades to simple routing if LlamaIndex is not available.
     """
     
+    # Tools exposed to agents; each is implemented by a _<name>_tool method
+    _TOOL_NAMES: ClassVar[Tuple[str, ...]] = (
+        "weaviate_search",
+        "get_cost_data",
+        "find_idle_ec2",
+        "find_s3_opportunities",
+        "generate_cloudformation",
+        "generate_diagram"
+    )
+    
+    _CFN_TEMPLATE: ClassVar[str] = """Generate a CloudFormation template in YAML format for:
+
+{description}
+
+Include:
+- Proper resource naming and dependencies
+- Security best practices
+- Outputs for important resource IDs
+- Comments explaining key sections"""
+    _CFN_SYSTEM_PROMPT: ClassVar[str] = "You are an expert in AWS CloudFormation. Generate clean, production-ready templates."
+    
+    # Generation settings for agent answers
+    _AGENT_MAX_TOKENS: ClassVar[int] = 1500
+    _AGENT_TEMPERATURE: ClassVar[float] = 0.7
+    
     def __init__(
         self,
         model_router: ModelRouter,
         weaviate_client: Optional[WeaviateClient] = None,
-        aws_clients: Optional[AWSClients] = None
+        aws_clients: Optional[AWSClients] = None,
+        semantic_cache: Optional[SemanticCache] = None
     ):
         self.model_router = model_router
         self.weaviate_client = weaviate_client or WeaviateClient()
         self.aws_clients = aws_clients or AWSClients()
+        self.semantic_cache = semantic_cache
         
         self.use_llamaindex = LLAMAINDEX_AVAILABLE
         
@@ -74,139 +145,124 @@ class LlamaAgentRouter:
             self.agents = self._create_simple_agents()
         
         # Reasoning trace
-        self.trace = []
+        self.trace = deque(maxlen=TRACE_MAX_STEPS)
     
     def _create_agent_tools(self) -> Dict[str, Any]:
         """Create tools for agents to use."""
         tools = {}
+        for name in self._TOOL_NAMES:
+            fn = getattr(self, f"_{name}_tool")
+            # Wrap as FunctionTool if LlamaIndex is available, otherwise
+            # store the bound method itself
+            if LLAMAINDEX_AVAILABLE:
+                tools[name] = FunctionTool.from_defaults(fn=fn, name=name)
+            else:
+                tools[name] = fn
+        return tools
+    
+    def _weaviate_search_tool(self, query: str, limit: int = 5) -> str:
+        """Search AWS documentation using semantic search."""
+        if not self.weaviate_client.is_available():
+            return "Weaviate not available. Using built-in knowledge."
+        
+        results = self.weaviate_client.hybrid_search(
+            collection_name="AWSDocs",
+            query=query,
+            limit=limit
+        )
         
-        # Weaviate search tool
-        def weaviate_search(query: str, limit: int = 5) -> str:
-            """Search AWS documentation using semantic search."""
-            if not self.weaviate_client.is_available():
-                return "Weaviate not available. Using built-in knowledge."
-            
-            results = self.weaviate_client.hybrid_search(
-                collection_name="AWSDocs",
-                query=query,
-                limit=limit
-            )
-            
-            if not results:
-                return "No relevant documentation found."
-            
-            formatted = "Found documentation:\n\n"
-            for i, doc in enumerate(results, 1):
-                formatted += f"{i}. {doc.get('title', 'AWS Docs')}\n"
-                formatted += f"   {doc.get('content', '')[:300]}...\n"
-                formatted += f"   Source: {doc.get('url', 'N/A')}\n\n"
-            
-            return formatted
+        if not results:
+            return "No relevant documentation found."
         
-        # Cost Explorer tool
-        def get_cost_data() -> str:
-            """Get AWS cost and usage data."""
-            data = self.aws_clients.get_cost_data()
-            
-            formatted = f"Total Cost: ${data['total_cost']}\n\n"
-            formatted += "Cost by Service:\n"
+        return "Found documentation:\n\n" + "".join(
+            f"{i}. {doc.get('title', 'AWS Docs')}\n"
+            f"   {doc.get('content', '')[:300]}...\n"
+            f"   Source: {doc.get('url', 'N/A')}\n\n"
+            for i, doc in enumerate(results, 1)
+        )
+    
+    def _get_cost_data_tool(self) -> str:
+        """Get AWS cost and usage data."""
+        data = self.aws_clients.get_cost_data()
+        
+        parts = [f"Total Cost: ${data['total_cost']}\n\n", "Cost by Service:\n"]
+        parts.extend(
+            f"  - {service}: ${cost:.2f}\n"
             for service, cost in sorted(
                 data['cost_by_service'].items(),
                 key=lambda x: x[1],
                 reverse=True
-            ):
-                formatted += f"  - {service}: ${cost:.2f}\n"
-            
-            return formatted
+            )
+        )
         
-        # EC2 optimization tool
-        def find_idle_ec2() -> str:
-            """Find idle or underutilized EC2 instances."""
-            instances = self.aws_clients.list_idle_ec2_instances()
-            
-            if not instances:
-                return "No idle instances found."
-            
-            formatted = f"Found {len(instances)} potentially idle instances:\n\n"
-            total_savings = 0.0
-            
-            for inst in instances:
-                cost = inst.get('monthly_cost', 0)
-                total_savings += cost
-                formatted += f"- {inst['instance_id']} ({inst['instance_type']})\n"
-                formatted += f"  CPU: {inst.get('cpu_utilization', 0):.1f}%\n"
-                formatted += f"  Monthly cost: ${cost:.2f}\n"
-            
-            formatted += f"\nPotential monthly savings: ${total_savings:.2f}"
-            return formatted
+        return "".join(parts)
+    
+    def _find_idle_ec2_tool(self) -> str:
+        """Find idle or underutilized EC2 instances."""
+        instances = self.aws_clients.list_idle_ec2_instances()
+        
+        if not instances:
+            return "No idle instances found."
+        
+        parts = [f"Found {len(instances)} potentially idle instances:\n\n"]
+        total_savings = 0.0
+        
+        for inst in instances:
+            cost = inst.get('monthly_cost', 0)
+            total_savings += cost
+            parts.append(
+                f"- {inst['instance_id']} ({inst['instance_type']})\n"
+                f"  CPU: {inst.get('cpu_utilization', 0):.1f}%\n"
+                f"  Monthly cost: ${cost:.2f}\n"
+            )
         
-        # S3 optimization tool
-        def find_s3_opportunities() -> str:
-            """Find S3 lifecycle optimization opportunities."""
-            opportunities = self.aws_clients.analyze_s3_lifecycle_opportunities()
-            
-            if not opportunities:
-                return "All S3 buckets have lifecycle policies."
-            
-            formatted = f"Found {len(opportunities)} S3 optimization opportunities:\n\n"
-            total_savings = 0.0
-            
-            for opp in opportunities:
-                savings = opp.get('estimated_savings', 0)
-                total_savings += savings
-                formatted += f"- {opp['bucket_name']}\n"
-                formatted += f"  {opp['recommendation']}\n"
-                formatted += f"  Est. savings: ${savings:.2f}/mo\n\n"
-            
-            formatted += f"Total potential savings: ${total_savings:.2f}/mo"
-            return formatted
+        parts.append(f"\nPotential monthly savings: ${total_savings:.2f}")
+        return "".join(parts)
+    
+    def _find_s3_opportunities_tool(self) -> str:
+        """Find S3 lifecycle optimization opportunities."""
+        opportunities = self.aws_clients.analyze_s3_lifecycle_opportunities()
+        
+        if not opportunities:
+            return "All S3 buckets have lifecycle policies."
+        
+        parts = [f"Found {len(opportunities)} S3 optimization opportunities:\n\n"]
+        total_savings = 0.0
+        
+        for opp in opportunities:
+            savings = opp.get('estimated_savings', 0)
+            total_savings += savings
+            parts.append(
+                f"- {opp['bucket_name']}\n"
+                f"  {opp['recommendation']}\n"
+                f"  Est. savings: ${savings:.2f}/mo\n\n"
+            )
         
-        # CloudFormation generation tool
-        def generate_cloudformation(description: str) -> str:
-            """Generate CloudFormation template from description."""
-            prompt = f"""Generate a CloudFormation template in YAML format for:
-
-{description}
-
-Include:
-- Proper resource naming and dependencies
-- Security best practices
-- Outputs for important resource IDs
-- Comments explaining key sections"""
-            
-            response = self.model_router.llm_complete(
+        parts.append(f"Total potential savings: ${total_savings:.2f}/mo")
+        return "".join(parts)
+    
+    def _generate_cloudformation_tool(self, description: str) -> str:
+        """Generate CloudFormation template from description."""
+        prompt = self._CFN_TEMPLATE.format(description=description)
+        
+        response = self._cached_complete(
+            prompt,
+            self._CFN_SYSTEM_PROMPT,
+            lambda: self.model_router.llm_complete(
                 prompt=prompt,
-                system_prompt="You are an expert in AWS CloudFormation. Generate clean, production-ready templates.",
+                system_prompt=self._CFN_SYSTEM_PROMPT,
                 max_tokens=2000,
                 temperature=0.3
-            )
-            
-            return response.text
-        
-        # Excalidraw diagram generation tool
-        def generate_diagram(description: str) -> str:
-            """Generate Excalidraw diagram JSON from architecture description."""
-            # Simplified version - in production would generate actual Excalidraw JSON
-            return f"Diagram generated for: {description}\n(Excalidraw JSON would be generated here)"
-        
-        # Convert tools to FunctionTool if LlamaIndex is available
-        if LLAMAINDEX_AVAILABLE:
-            tools['weaviate_search'] = FunctionTool.from_defaults(fn=weaviate_search)
-            tools['get_cost_data'] = FunctionTool.from_defaults(fn=get_cost_data)
-            tools['find_idle_ec2'] = FunctionTool.from_defaults(fn=find_idle_ec2)
-            tools['find_s3_opportunities'] = FunctionTool.from_defaults(fn=find_s3_opportunities)
-            tools['generate_cloudformation'] = FunctionTool.from_defaults(fn=generate_cloudformation)
-            tools['generate_diagram'] = FunctionTool.from_defaults(fn=generate_diagram)
-        else:
-            # Store as regular functions
-            tools['weaviate_search'] = weaviate_search
-            tools['get_cost_data'] = get_cost_data
-            tools['find_idle_ec2'] = find_idle_ec2
-            tools['find_s3_opportunities'] = find_s3_opportunities
-            tools['generate_cloudformation'] = generate_cloudformation
-            tools['generate_diagram'] = generate_diagram
+            ),
+            scope="cloudformation:2000:0.3"
+        )
         
-        return tools
+        return response.text
+    
+    def _generate_diagram_tool(self, description: str) -> str:
+        """Generate Excalidraw diagram JSON from architecture description."""
+        # Simplified version - in production would generate actual Excalidraw JSON
+        return f"Diagram generated for: {description}\n(Excalidraw JSON would be generated here)"
     
     def _create_llamaindex_agents(self) -> Dict[str, Any]:
         """Create LlamaIndex FunctionCallingAgents."""
@@ -249,52 +305,14 @@ Include:
         Returns:
             Agent name
         """
-        query_lower = query.lower()
-        
-        # Optimization-related keywords (check first)
-        if any(word in query_lower for word in [
-            "optimize", "reduce cost", "save money", "cheaper",
-            "expensive", "savings", "cut cost", "idle", "waste"
-        ]):
-            self.trace.append({
-                "step": "routing",
-                "decision": "optimize",
-                "reason": "Query contains cost optimization keywords"
-            })
-            return "optimize"
-        
-        # Setup-related keywords
-        elif any(word in query_lower for word in [
-            "setup", "deploy", "create", "infrastructure", "cloudformation",
-            "provision", "launch", "configure", "architecture"
-        ]):
-            self.trace.append({
-                "step": "routing",
-                "decision": "setup",
-                "reason": "Query related to infrastructure setup"
-            })
-            return "setup"
-        
-        # Billing-related keywords
-        elif any(word in query_lower for word in [
-            "bill", "billing", "charge", "invoice", "cost breakdown",
-            "why am i charged", "understand my bill", "spending"
-        ]):
-            self.trace.append({
-                "step": "routing",
-                "decision": "bills",
-                "reason": "Query about billing and charges"
-            })
-            return "bills"
-        
-        # Documentation-related keywords (default)
-        else:
+        decision, reason = _classify_query(query.lower())
+        if TRACING_ENABLED:
             self.trace.append({
                 "step": "routing",
-                "decision": "docs",
-                "reason": "General documentation query"
+                "decision": decision,
+                "reason": reason
             })
-            return "docs"
+        return decision
     
     def process_query(
         self,
@@ -314,19 +332,9 @@ Include:
             AgentResponse with result and reasoning trace
         """
         # Reset trace
-        self.trace = []
-        
-        # Route to agent
-        if preferred_agent and preferred_agent in self.agents:
-            agent_name = preferred_agent
-            self.trace.append({
-                "step": "routing",
-                "decision": agent_name,
-                "reason": "User-selected agent"
-            })
-        else:
-            agent_name = self.route_query(query)
+        self.trace = deque(maxlen=TRACE_MAX_STEPS)
         
+        agent_name = self._select_agent(query, preferred_agent)
         agent = self.agents[agent_name]
         
         # Build context for agent
@@ -343,10 +351,29 @@ Include:
             model=response.model,
             latency_ms=response.latency_ms,
             reasoning=self._format_reasoning(agent_name, query),
-            trace=self.trace.copy(),
+            trace=list(self.trace),
             success=response.success
         )
     
+    def _select_agent(self, query: str, preferred_agent: Optional[str]) -> str:
+        """Return the user-selected agent if valid, otherwise route the query."""
+        if preferred_agent and preferred_agent in self.agents:
+            if TRACING_ENABLED:
+                self.trace.append({
+                    "step": "routing",
+                    "decision": preferred_agent,
+                    "reason": "User-selected agent"
+                })
+            return preferred_agent
+        return self.route_query(query)
+    
+    @staticmethod
+    def _build_prompt(query: str, context: str) -> str:
+        """Append the agent context to the query."""
+        if context:
+            return f"{query}\n\n{context}"
+        return query
+    
     def _build_agent_context(
         self,
         agent_name: str,
@@ -354,38 +381,29 @@ Include:
         context: Optional[Dict[str, Any]]
     ) -> str:
         """Build context string for agent."""
-        context_parts = []
-        
-        # Add relevant tool outputs to context
+        # (tool, heading, args) for each tool the agent uses, in context order
+        calls = []
         if agent_name == "docs" or agent_name == "setup":
-            # Search documentation
-            self.trace.append({"step": "tool_call", "tool": "weaviate_search", "query": query})
-            search_func = self.tools["weaviate_search"]
-            if callable(search_func):
-                docs = search_func(query, limit=3)
-                context_parts.append(f"Relevant Documentation:\n{docs}")
-        
+            calls.append(("weaviate_search", "Relevant Documentation", (query, 3)))
         if agent_name == "bills" or agent_name == "optimize":
-            # Get cost data
-            self.trace.append({"step": "tool_call", "tool": "get_cost_data"})
-            cost_func = self.tools["get_cost_data"]
-            if callable(cost_func):
-                cost_data = cost_func()
-                context_parts.append(f"Current Costs:\n{cost_data}")
-        
+            calls.append(("get_cost_data", "Current Costs", ()))
         if agent_name == "optimize":
-            # Get optimization opportunities
-            self.trace.append({"step": "tool_call", "tool": "find_idle_ec2"})
-            ec2_func = self.tools["find_idle_ec2"]
-            if callable(ec2_func):
-                ec2_data = ec2_func()
-                context_parts.append(f"EC2 Analysis:\n{ec2_data}")
-            
-            self.trace.append({"step": "tool_call", "tool": "find_s3_opportunities"})
-            s3_func = self.tools["find_s3_opportunities"]
-            if callable(s3_func):
-                s3_data = s3_func()
-                context_parts.append(f"S3 Analysis:\n{s3_data}")
+            calls.append(("find_idle_ec2", "EC2 Analysis", ()))
+            calls.append(("find_s3_opportunities", "S3 Analysis", ()))
+        
+        # The tools are independent network calls, so run them concurrently
+        futures = []
+        for tool_name, heading, args in calls:
+            if TRACING_ENABLED:
+                step = {"step": "tool_call", "tool": tool_name}
+                if tool_name == "weaviate_search":
+                    step["query"] = query[:TRACE_QUERY_CHARS]
+                self.trace.append(step)
+            func = self.tools[tool_name]
+            if callable(func):
+                futures.append((heading, IO_EXECUTOR.submit(func, *args)))
+        
+        context_parts = [f"{heading}:\n{future.result()}" for heading, future in futures]
         
         # Add user-provided context
         if context:
@@ -401,34 +419,52 @@ Include:
         context: str
     ) -> LLMResponse:
         """Execute agent with query and context."""
-        self.trace.append({
-            "step": "agent_execution",
-            "agent": agent_name,
-            "query": query
-        })
-        
-        # Build full prompt
-        full_prompt = query
-        if context:
-            full_prompt = f"{query}\n\n{context}"
-        
-        # Call LLM
-        response = self.model_router.llm_complete(
-            prompt=full_prompt,
-            system_prompt=agent["system_prompt"],
-            max_tokens=1500,
-            temperature=0.7
+        if TRACING_ENABLED:
+            self.trace.append({
+                "step": "agent_execution",
+                "agent": agent_name,
+                "query": query[:TRACE_QUERY_CHARS]
+            })
+        
+        full_prompt = self._build_prompt(query, context)
+        
+        # Call LLM; cached answers are scoped to the tool output they were
+        # based on, so a paraphrased query only hits on the same data
+        context_hash = hashlib.sha256(context.encode()).hexdigest()
+        response = self._cached_complete(
+            full_prompt,
+            agent["system_prompt"],
+            lambda: self.model_router.llm_complete(
+                prompt=full_prompt,
+                system_prompt=agent["system_prompt"],
+                max_tokens=self._AGENT_MAX_TOKENS,
+                temperature=self._AGENT_TEMPERATURE
+            ),
+            scope=f"{agent_name}:{self._AGENT_MAX_TOKENS}:{self._AGENT_TEMPERATURE}:{context_hash}"
         )
         
-        self.trace.append({
-            "step": "llm_response",
-            "provider": response.provider,
-            "latency_ms": response.latency_ms,
-            "success": response.success
-        })
+        if TRACING_ENABLED:
+            self.trace.append({
+                "step": "llm_response",
+                "provider": response.provider,
+                "latency_ms": response.latency_ms,
+                "success": response.success
+            })
         
         return response
     
+    def _cached_complete(
+        self,
+        prompt: str,
+        system_prompt: str,
+        compute: Callable[[], LLMResponse],
+        scope: str
+    ) -> LLMResponse:
+        """Run compute() through the semantic cache when one is set."""
+        if not self.semantic_cache:
+            return compute()
+        return self.semantic_cache.get_or_compute(prompt, system_prompt, compute, scope=scope)
+    
     def _format_reasoning(self, agent_name: str, query: str) -> str:
         """Format reasoning trace as human-readable string."""
         reasoning_templates = {
@@ -441,4 +477,4 @@ Include:
     
     def get_trace(self) -> List[Dict[str, Any]]:
         """Get the reasoning trace."""
-        return self.trace.copy()
+        return list(self.trace)
@@ -1,25 +1,19 @@
 """
 Setup Buddy Agent - Enhanced with tools for CloudFormation and Excalidraw.
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, ClassVar, TYPE_CHECKING
 from backend.utils.model_router import ModelRouter, LLMResponse
 from backend.utils.weaviate_client import WeaviateClient
+from backend.agents._common import format_context
+
+if TYPE_CHECKING:
+    from backend.utils.semantic_cache import SemanticCache
 
 
 class SetupBuddyAgent:
     """Agent specialized in AWS infrastructure setup and deployment."""
     
-    def __init__(
-        self,
-        model_router: ModelRouter,
-        weaviate_client: Optional[WeaviateClient] = None
-    ):
-        self.model_router = model_router
-        self.weaviate_client = weaviate_client
-        self.name = "Setup Buddy"
-    
-    def get_system_prompt(self) -> str:
-        return """You are Setup Buddy, an expert AWS infrastructure consultant. Your role is to:
+    _SYSTEM_PROMPT: ClassVar[str] = """You are Setup Buddy, an expert AWS infrastructure consultant. Your role is to:
 
 1. Help users design and deploy AWS infrastructure
 2. Generate CloudFormation templates for common patterns
@@ -31,6 +25,34 @@ class SetupBuddyAgent:
 Always be friendly, clear, and practical. Focus on helping users get their infrastructure up and running quickly and correctly.
 When providing CloudFormation templates, use YAML format and include proper resource naming, dependencies, and outputs."""
     
+    _CFN_TEMPLATE: ClassVar[str] = """Generate a CloudFormation template in YAML format for the following infrastructure:
+
+{description}
+
+Include:
+- Proper resource naming and logical IDs
+- Resource dependencies using DependsOn where needed
+- Security best practices (security groups, IAM roles, encryption)
+- Outputs for important resource IDs and endpoints
+- Comments explaining key sections
+- Parameters for customization where appropriate
+
+Follow AWS CloudFormation best practices and make the template production-ready."""
+    
+    def __init__(
+        self,
+        model_router: ModelRouter,
+        weaviate_client: Optional[WeaviateClient] = None,
+        semantic_cache: Optional['SemanticCache'] = None
+    ):
+        self.model_router = model_router
+        self.weaviate_client = weaviate_client
+        self.semantic_cache = semantic_cache
+        self.name = "Setup Buddy"
+    
+    def get_system_prompt(self) -> str:
+        return self._SYSTEM_PROMPT
+    
     def process(self, user_input: str, context: Optional[Dict[str, Any]] = None) -> LLMResponse:
         """Process setup-related queries."""
         
@@ -43,48 +65,27 @@ When providing CloudFormation templates, use YAML format and include proper reso
                 limit=3
             )
             if docs:
-                relevant_docs = "\n\nRelevant AWS Documentation:\n"
-                for i, doc in enumerate(docs, 1):
-                    relevant_docs += f"\n{i}. {doc.get('title', 'AWS Docs')}\n"
-                    relevant_docs += f"   {doc.get('content', '')[:300]}...\n"
+                relevant_docs = "\n\nRelevant AWS Documentation:\n" + "".join(
+                    f"\n{i}. {doc.get('title', 'AWS Docs')}\n"
+                    f"   {doc.get('content', '')[:300]}...\n"
+                    for i, doc in enumerate(docs, 1)
+                )
         
         # Build prompt with context
         prompt = user_input + relevant_docs
         if context:
-            prompt += self._format_context(context)
+            prompt += format_context(context)
         
         # Generate response using model router
-        response = self.model_router.llm_complete(
-            prompt=prompt,
-            system_prompt=self.get_system_prompt(),
-            max_tokens=1500,
-            temperature=0.7
-        )
+        response = self._complete(prompt, max_tokens=1500, temperature=0.7)
         
         return response
     
     def generate_cloudformation(self, infrastructure_desc: str) -> LLMResponse:
         """Generate CloudFormation template based on description."""
-        prompt = f"""Generate a CloudFormation template in YAML format for the following infrastructure:
-
-{infrastructure_desc}
-
-Include:
-- Proper resource naming and logical IDs
-- Resource dependencies using DependsOn where needed
-- Security best practices (security groups, IAM roles, encryption)
-- Outputs for important resource IDs and endpoints
-- Comments explaining key sections
-- Parameters for customization where appropriate
-
-Follow AWS CloudFormation best practices and make the template production-ready."""
+        prompt = self._CFN_TEMPLATE.format(description=infrastructure_desc)
         
-        response = self.model_router.llm_complete(
-            prompt=prompt,
-            system_prompt=self.get_system_prompt(),
-            max_tokens=2000,
-            temperature=0.3
-        )
+        response = self._complete(prompt, max_tokens=2000, temperature=0.3)
         
         return response
     
@@ -102,21 +103,33 @@ Format as:
 
 Be concise and focus on the key components."""
         
-        response = self.model_router.llm_complete(
-            prompt=prompt,
-            system_prompt=self.get_system_prompt(),
-            max_tokens=800,
-            temperature=0.5
-        )
+        # A short resource list doesn't need the large model
+        response = self._complete(prompt, max_tokens=800, temperature=0.5, prefer_small_model=True)
         
         return response.text
     
-    def _format_context(self, context: Dict[str, Any]) -> str:
-        """Format context dictionary into a string."""
-        if not context:
-            return ""
+    def _complete(
+        self,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        prefer_small_model: bool = False
+    ) -> LLMResponse:
+        """Call the LLM, going through the semantic cache when one is set."""
+        def compute() -> LLMResponse:
+            return self.model_router.llm_complete(
+                prompt=prompt,
+                system_prompt=self.get_system_prompt(),
+                max_tokens=max_tokens,
+                temperature=temperature,
+                prefer_small_model=prefer_small_model
+            )
         
-        formatted = "\n\nAdditional Context:\n"
-        for key, value in context.items():
-            formatted += f"- {key}: {value}\n"
-        return formatted
+        if not self.semantic_cache:
+            return compute()
+        return self.semantic_cache.get_or_compute(
+            prompt,
+            self.get_system_prompt(),
+            compute,
+            scope=f"{max_tokens}:{temperature}:{prefer_small_model}"
+        )
@@ -1,8 +1,16 @@
 """
 Convert Excalidraw diagram shapes to CloudFormation hints.
 """
+import functools
 import json
-from typing import Dict, Any, List, Optional
+import math
+from collections import defaultdict
+from typing import Dict, Any, List, Optional, Tuple
+
+# Maps ASCII characters that can't appear in a logical name to spaces
+_LOGICAL_NAME_TABLE = str.maketrans({
+    c: ' ' for c in map(chr, range(128)) if not c.isalnum()
+})
 
 
 class ExcalidrawToCFNConverter:
@@ -28,6 +36,42 @@ class ExcalidrawToCFNConverter:
         }
     }
     
+    # Starting CloudFormation properties per resource type
+    DEFAULT_PROPERTIES = {
+        'AWS::EC2::VPC': {
+            'CidrBlock': '10.0.0.0/16',
+            'EnableDnsHostnames': True,
+            'EnableDnsSupport': True
+        },
+        'AWS::EC2::Subnet': {
+            'CidrBlock': '10.0.1.0/24',
+            'VpcId': {'Ref': 'VPC'}
+        },
+        'AWS::EC2::Instance': {
+            'InstanceType': 't3.micro',
+            'ImageId': 'ami-0c55b159cbfafe1f0'  # Placeholder
+        },
+        'AWS::S3::Bucket': {
+            'BucketName': {'Fn::Sub': '${AWS::StackName}-bucket'}
+        },
+        'AWS::RDS::DBInstance': {
+            'DBInstanceClass': 'db.t3.micro',
+            'Engine': 'mysql',
+            'AllocatedStorage': '20'
+        },
+        'AWS::Lambda::Function': {
+            'Runtime': 'python3.9',
+            'Handler': 'index.handler',
+            'Code': {
+                'ZipFile': 'def handler(event, context):\n    return {"statusCode": 200}'
+            }
+        }
+    }
+    
+    # Max distance in pixels between a shape and its label; also the cell
+    # size of the grid used to look labels up
+    LABEL_DISTANCE = 100
+    
     def __init__(self):
         self.resources = {}
         self.connections = []
@@ -77,13 +121,8 @@ class ExcalidrawToCFNConverter:
         """Identify AWS resources from shapes and text labels."""
         resources = []
         
-        # Create a map of text positions to text content
-        text_map = {}
-        for text in texts:
-            x = text.get('x', 0)
-            y = text.get('y', 0)
-            content = text.get('text', '').lower()
-            text_map[(x, y)] = content
+        # Bucket labels into a grid once so each shape only checks nearby cells
+        text_index = self._build_text_index(texts)
         
         for shape in shapes:
             shape_type = shape.get('type')
@@ -91,8 +130,8 @@ class ExcalidrawToCFNConverter:
             x = shape.get('x', 0)
             y = shape.get('y', 0)
             
-            # Find nearby text (within 50 pixels)
-            label = self._find_nearby_text(x, y, text_map)
+            # Find nearby text (within LABEL_DISTANCE pixels)
+            label = self._find_nearby_text(x, y, text_index)
             
             # Determine resource type
             resource_type = self._infer_resource_type(shape_type, label)
@@ -108,19 +147,44 @@ class ExcalidrawToCFNConverter:
         
         return resources
     
+    def _build_text_index(
+        self,
+        texts: List[Dict[str, Any]]
+    ) -> Dict[Tuple[int, int], List[Tuple[float, float, str]]]:
+        """Bucket text elements into LABEL_DISTANCE-sized grid cells."""
+        cell = self.LABEL_DISTANCE
+        text_index = defaultdict(list)
+        for text in texts:
+            x = text.get('x', 0)
+            y = text.get('y', 0)
+            content = text.get('text', '').lower()
+            text_index[(math.floor(x / cell), math.floor(y / cell))].append((x, y, content))
+        return text_index
+    
     def _find_nearby_text(
         self,
         x: float,
         y: float,
-        text_map: Dict[tuple, str],
-        threshold: float = 100
+        text_index: Dict[Tuple[int, int], List[Tuple[float, float, str]]],
+        threshold: Optional[float] = None
     ) -> Optional[str]:
-        """Find text near a given position."""
-        for (tx, ty), content in text_map.items():
-            distance = ((x - tx) ** 2 + (y - ty) ** 2) ** 0.5
-            if distance < threshold:
-                return content
-        return None
+        """Find the closest text within threshold of a given position."""
+        if threshold is None:
+            threshold = self.LABEL_DISTANCE
+        cell = self.LABEL_DISTANCE
+        reach = math.ceil(threshold / cell)
+        cx = math.floor(x / cell)
+        cy = math.floor(y / cell)
+        
+        best = None
+        best_d2 = threshold * threshold
+        for i in range(cx - reach, cx + reach + 1):
+            for j in range(cy - reach, cy + reach + 1):
+                for tx, ty, content in text_index.get((i, j), ()):
+                    d2 = (x - tx) ** 2 + (y - ty) ** 2
+                    if d2 < best_d2:
+                        best, best_d2 = content, d2
+        return best
     
     def _infer_resource_type(self, shape_type: str, label: Optional[str]) -> Optional[str]:
         """Infer AWS resource type from shape and label."""
@@ -186,6 +250,8 @@ class ExcalidrawToCFNConverter:
     ) -> Dict[str, Any]:
         """Generate CloudFormation template structure."""
         cfn_resources = {}
+        # Diagram element ID -> logical name, for resolving connections
+        id_to_logical = {}
         
         for resource in resources:
             resource_id = resource['id']
@@ -194,6 +260,7 @@ class ExcalidrawToCFNConverter:
             
             # Generate logical resource name
             logical_name = self._to_logical_name(label)
+            id_to_logical.setdefault(resource_id, logical_name)
             
             # Basic resource definition
             cfn_resources[logical_name] = {
@@ -211,13 +278,11 @@ class ExcalidrawToCFNConverter:
             to_id = conn['to']
             
             # Find logical names
-            from_name = self._find_logical_name(from_id, resources, cfn_resources)
-            to_name = self._find_logical_name(to_id, resources, cfn_resources)
+            from_name = id_to_logical.get(from_id)
+            to_name = id_to_logical.get(to_id)
             
-            if from_name and to_name and from_name in cfn_resources:
-                if 'DependsOn' not in cfn_resources[from_name]:
-                    cfn_resources[from_name]['DependsOn'] = []
-                cfn_resources[from_name]['DependsOn'].append(to_name)
+            if from_name and to_name:
+                cfn_resources[from_name].setdefault('DependsOn', []).append(to_name)
         
         return {
             'AWSTemplateFormatVersion': '2010-09-09',
@@ -226,47 +291,26 @@ class ExcalidrawToCFNConverter:
             'Outputs': self._generate_outputs(cfn_resources)
         }
     
-    def _to_logical_name(self, label: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _to_logical_name(label: str) -> str:
         """Convert label to CloudFormation logical name."""
         # Remove special characters and capitalize words
-        clean = ''.join(c if c.isalnum() else ' ' for c in label)
+        if label.isascii():
+            clean = label.translate(_LOGICAL_NAME_TABLE)
+        else:
+            clean = ''.join(c if c.isalnum() else ' ' for c in label)
         words = clean.split()
         return ''.join(word.capitalize() for word in words) or 'Resource'
     
     def _get_default_properties(self, resource_type: str) -> Dict[str, Any]:
         """Get default properties for a resource type."""
-        defaults = {
-            'AWS::EC2::VPC': {
-                'CidrBlock': '10.0.0.0/16',
-                'EnableDnsHostnames': True,
-                'EnableDnsSupport': True
-            },
-            'AWS::EC2::Subnet': {
-                'CidrBlock': '10.0.1.0/24',
-                'VpcId': {'Ref': 'VPC'}
-            },
-            'AWS::EC2::Instance': {
-                'InstanceType': 't3.micro',
-                'ImageId': 'ami-0c55b159cbfafe1f0'  # Placeholder
-            },
-            'AWS::S3::Bucket': {
-                'BucketName': {'Fn::Sub': '${AWS::StackName}-bucket'}
-            },
-            'AWS::RDS::DBInstance': {
-                'DBInstanceClass': 'db.t3.micro',
-                'Engine': 'mysql',
-                'AllocatedStorage': '20'
-            },
-            'AWS::Lambda::Function': {
-                'Runtime': 'python3.9',
-                'Handler': 'index.handler',
-                'Code': {
-                    'ZipFile': 'def handler(event, context):\n    return {"statusCode": 200}'
-                }
-            }
+        # Each resource gets its own copy so the dumped YAML has no aliases;
+        # nested values are at most one level deep
+        return {
+            key: dict(value) if isinstance(value, dict) else value
+            for key, value in self.DEFAULT_PROPERTIES.get(resource_type, {}).items()
         }
-        
-        return defaults.get(resource_type, {})
     
     def _generate_outputs(self, resources: Dict[str, Any]) -> Dict[str, Any]:
         """Generate CloudFormation outputs."""
@@ -287,21 +331,6 @@ class ExcalidrawToCFNConverter:
                 }
         
         return outputs
-    
-    def _find_logical_name(
-        self,
-        diagram_id: str,
-        resources: List[Dict[str, Any]],
-        cfn_resources: Dict[str, Any]
-    ) -> Optional[str]:
-        """Find CloudFormation logical name from diagram ID."""
-        for resource in resources:
-            if resource['id'] == diagram_id:
-                label = resource['label']
-                logical_name = self._to_logical_name(label)
-                if logical_name in cfn_resources:
-                    return logical_name
-        return None
 
 
 def convert_board_to_cfn(excalidraw_json: Dict[str, Any]) -> str:
@@ -1,15 +1,27 @@
 """Backend utilities for Nimbus Copilot."""
-from .model_router import ModelRouter, LLMResponse
-from .weaviate_client import WeaviateClient
-from .aws_clients import AWSClients
-from .friendli import FriendliClient
-from .bedrock import BedrockClient
-
-__all__ = [
-    'ModelRouter',
-    'LLMResponse',
-    'WeaviateClient',
-    'AWSClients',
-    'FriendliClient',
-    'BedrockClient'
-]
+import importlib
+
+# Exports resolved on first access, so importing one submodule (e.g. the
+# model router) doesn't also import the AWS and Weaviate clients
+_EXPORTS = {
+    'ModelRouter': '.model_router',
+    'LLMResponse': '.model_router',
+    'WeaviateClient': '.weaviate_client',
+    'AWSClients': '.aws_clients',
+    'FriendliClient': '.friendli',
+    'BedrockClient': '.bedrock',
+    'timed': '.timing',
+    'IO_EXECUTOR': '.executor',
+    'SemanticCache': '.semantic_cache'
+}
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+__all__ = list(_EXPORTS)
@@ -2,15 +2,29 @@
 AWS service clients for Cost Explorer, EC2, S3, etc.
 """
 import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 try:
     import boto3
+    from botocore.config import Config
     BOTO3_AVAILABLE = True
 except ImportError:
     BOTO3_AVAILABLE = False
 
+# Connection pool size per client
+MAX_POOL_CONNECTIONS = 16
+
+# Largest page size DescribeInstances / DescribeSnapshots accept
+EC2_PAGE_SIZE = 1000
+# Most metric queries a single GetMetricData call accepts
+METRIC_DATA_BATCH_SIZE = 500
+# Instances averaging below this CPU % over the lookback window count as idle
+IDLE_CPU_THRESHOLD = 5.0
+IDLE_LOOKBACK_DAYS = 14
+
 
 class AWSClients:
     """Wrapper for AWS service clients."""
@@ -22,12 +36,24 @@ class AWSClients:
         self.ce_client = None
         self.ec2_client = None
         self.s3_client = None
+        self.cloudwatch_client = None
         
         if BOTO3_AVAILABLE and not self.use_mock:
             try:
-                self.ce_client = boto3.client('ce', region_name=self.region)
-                self.ec2_client = boto3.client('ec2', region_name=self.region)
-                self.s3_client = boto3.client('s3', region_name=self.region)
+                # One session and config shared by all clients so connections are pooled
+                session = boto3.session.Session(region_name=self.region)
+                config = Config(
+                    max_pool_connections=MAX_POOL_CONNECTIONS,
+                    retries={'max_attempts': 2, 'mode': 'standard'},
+                    connect_timeout=2,
+                    read_timeout=5,
+                    # Keep pooled connections alive between tool calls
+                    tcp_keepalive=True
+                )
+                self.ce_client = session.client('ce', config=config)
+                self.ec2_client = session.client('ec2', config=config)
+                self.s3_client = session.client('s3', config=config)
+                self.cloudwatch_client = session.client('cloudwatch', config=config)
             except Exception as e:
                 print(f"Warning: Failed to initialize AWS clients: {e}")
     
@@ -59,35 +85,39 @@ class AWSClients:
                 start = datetime.now() - timedelta(days=90)
                 start_date = start.strftime("%Y-%m-%d")
             
-            response = self.ce_client.get_cost_and_usage(
-                TimePeriod={
+            request = {
+                'TimePeriod': {
                     'Start': start_date,
                     'End': end_date
                 },
-                Granularity=granularity,
-                Metrics=['UnblendedCost'],
-                GroupBy=[
+                'Granularity': granularity,
+                'Metrics': ['UnblendedCost'],
+                'GroupBy': [
                     {'Type': 'DIMENSION', 'Key': 'SERVICE'}
                 ]
-            )
+            }
             
-            # Parse response
-            cost_by_service = {}
-            total_cost = 0.0
+            # Cost Explorer has no boto3 paginator; follow NextPageToken so
+            # large accounts aren't truncated
+            cost_by_service = Counter()
+            while True:
+                response = self.ce_client.get_cost_and_usage(**request)
+                for result in response.get('ResultsByTime', []):
+                    for group in result.get('Groups', []):
+                        cost_by_service[group['Keys'][0]] += float(
+                            group['Metrics']['UnblendedCost']['Amount']
+                        )
+                
+                token = response.get('NextPageToken')
+                if not token:
+                    break
+                request['NextPageToken'] = token
             
-            for result in response.get('ResultsByTime', []):
-                for group in result.get('Groups', []):
-                    service = group['Keys'][0]
-                    amount = float(group['Metrics']['UnblendedCost']['Amount'])
-                    
-                    if service not in cost_by_service:
-                        cost_by_service[service] = 0.0
-                    cost_by_service[service] += amount
-                    total_cost += amount
+            total_cost = sum(cost_by_service.values())
             
             return {
                 "total_cost": round(total_cost, 2),
-                "cost_by_service": cost_by_service,
+                "cost_by_service": dict(cost_by_service),
                 "period": {
                     "start": start_date,
                     "end": end_date
@@ -103,29 +133,47 @@ class AWSClients:
         List EC2 instances with low CPU utilization (potentially idle).
         
         Returns:
-            List of idle instance dictionaries
+            List of idle instance dictionaries, each with a monthly_cost
         """
         if self.use_mock or not self.ec2_client:
             return self._get_mock_idle_instances()
         
         try:
-            response = self.ec2_client.describe_instances(
+            paginator = self.ec2_client.get_paginator('describe_instances')
+            pages = paginator.paginate(
                 Filters=[
                     {'Name': 'instance-state-name', 'Values': ['running']}
-                ]
+                ],
+                PaginationConfig={'PageSize': EC2_PAGE_SIZE}
+            )
+            
+            running = [
+                instance
+                for page in pages
+                for reservation in page.get('Reservations', [])
+                for instance in reservation.get('Instances', [])
+            ]
+            cpu_by_instance = self._average_cpu_utilization(
+                [instance['InstanceId'] for instance in running]
             )
             
             idle_instances = []
-            for reservation in response.get('Reservations', []):
-                for instance in reservation.get('Instances', []):
-                    # In production, would check CloudWatch metrics for CPU
-                    # For now, just return running instances
-                    idle_instances.append({
-                        "instance_id": instance['InstanceId'],
-                        "instance_type": instance['InstanceType'],
-                        "state": instance['State']['Name'],
-                        "launch_time": instance['LaunchTime'].isoformat()
-                    })
+            for instance in running:
+                cpu = cpu_by_instance.get(instance['InstanceId'])
+                # Instances without CPU data are kept so they can be reviewed
+                if cpu is not None and cpu >= IDLE_CPU_THRESHOLD:
+                    continue
+                idle_instance = {
+                    "instance_id": instance['InstanceId'],
+                    "instance_type": instance['InstanceType'],
+                    "state": instance['State']['Name'],
+                    "launch_time": instance['LaunchTime'].isoformat(),
+                    # No pricing lookup yet; the key is always present for consumers
+                    "monthly_cost": 0.0
+                }
+                if cpu is not None:
+                    idle_instance["cpu_utilization"] = cpu
+                idle_instances.append(idle_instance)
             
             return idle_instances
         
@@ -133,6 +181,60 @@ class AWSClients:
             print(f"Error listing EC2 instances: {e}")
             return self._get_mock_idle_instances()
     
+    def _average_cpu_utilization(self, instance_ids: List[str]) -> Dict[str, float]:
+        """
+        Average CPUUtilization per instance over IDLE_LOOKBACK_DAYS.
+        
+        Uses batched GetMetricData calls rather than one request per instance.
+        Instances with no datapoints, or all of them if CloudWatch is
+        unavailable, are left out of the result.
+        """
+        if not self.cloudwatch_client or not instance_ids:
+            return {}
+        
+        end_time = datetime.now(timezone.utc)
+        start_time = end_time - timedelta(days=IDLE_LOOKBACK_DAYS)
+        averages = {}
+        
+        try:
+            paginator = self.cloudwatch_client.get_paginator('get_metric_data')
+            for offset in range(0, len(instance_ids), METRIC_DATA_BATCH_SIZE):
+                batch = instance_ids[offset:offset + METRIC_DATA_BATCH_SIZE]
+                queries = [
+                    {
+                        'Id': f"cpu{i}",
+                        'MetricStat': {
+                            'Metric': {
+                                'Namespace': 'AWS/EC2',
+                                'MetricName': 'CPUUtilization',
+                                'Dimensions': [{'Name': 'InstanceId', 'Value': instance_id}]
+                            },
+                            'Period': 86400,
+                            'Stat': 'Average'
+                        }
+                    }
+                    for i, instance_id in enumerate(batch)
+                ]
+                
+                values: Dict[str, List[float]] = {}
+                for page in paginator.paginate(
+                    MetricDataQueries=queries,
+                    StartTime=start_time,
+                    EndTime=end_time
+                ):
+                    for result in page.get('MetricDataResults', []):
+                        values.setdefault(result['Id'], []).extend(result.get('Values', []))
+                
+                for i, instance_id in enumerate(batch):
+                    datapoints = values.get(f"cpu{i}")
+                    if datapoints:
+                        averages[instance_id] = sum(datapoints) / len(datapoints)
+        
+        except Exception as e:
+            print(f"Error fetching CPU metrics: {e}")
+        
+        return averages
+    
     def list_old_snapshots(self, days_old: int = 90) -> List[Dict[str, Any]]:
         """
         List EBS snapshots older than specified days.
@@ -141,18 +243,23 @@ class AWSClients:
             days_old: Age threshold in days
             
         Returns:
-            List of old snapshot dictionaries
+            List of old snapshot dictionaries, each with volume_size and monthly_cost
         """
         if self.use_mock or not self.ec2_client:
             return self._get_mock_old_snapshots()
         
         try:
-            response = self.ec2_client.describe_snapshots(OwnerIds=['self'])
+            paginator = self.ec2_client.get_paginator('describe_snapshots')
+            pages = paginator.paginate(
+                OwnerIds=['self'],
+                Filters=[{'Name': 'status', 'Values': ['completed']}],
+                PaginationConfig={'PageSize': EC2_PAGE_SIZE}
+            )
             
             cutoff_date = datetime.now() - timedelta(days=days_old)
             old_snapshots = []
             
-            for snapshot in response.get('Snapshots', []):
+            for snapshot in (s for page in pages for s in page.get('Snapshots', [])):
                 start_time = snapshot['StartTime'].replace(tzinfo=None)
                 if start_time < cutoff_date:
                     old_snapshots.append({
@@ -160,7 +267,8 @@ class AWSClients:
                         "volume_id": snapshot.get('VolumeId', 'N/A'),
                         "start_time": snapshot['StartTime'].isoformat(),
                         "volume_size": snapshot['VolumeSize'],
-                        "description": snapshot.get('Description', '')
+                        "description": snapshot.get('Description', ''),
+                        "monthly_cost": 0.0
                     })
             
             return old_snapshots
@@ -174,32 +282,34 @@ class AWSClients:
         Analyze S3 buckets for lifecycle policy opportunities.
         
         Returns:
-            List of bucket optimization opportunities
+            List of bucket optimization opportunities, each with estimated_savings
         """
         if self.use_mock or not self.s3_client:
             return self._get_mock_s3_opportunities()
         
         try:
             response = self.s3_client.list_buckets()
+            buckets = response.get('Buckets', [])
+            if not buckets:
+                return []
+            
+            # Each probe is a blocking round-trip; run them concurrently,
+            # bounded by the client's connection pool
+            with ThreadPoolExecutor(max_workers=min(len(buckets), MAX_POOL_CONNECTIONS)) as executor:
+                has_lifecycle = list(executor.map(
+                    self._has_lifecycle_policy,
+                    [bucket['Name'] for bucket in buckets]
+                ))
             
             opportunities = []
-            for bucket in response.get('Buckets', []):
-                bucket_name = bucket['Name']
-                
-                # Check if lifecycle policy exists
-                try:
-                    self.s3_client.get_bucket_lifecycle_configuration(Bucket=bucket_name)
-                    has_lifecycle = True
-                except self.s3_client.exceptions.NoSuchLifecycleConfiguration:
-                    has_lifecycle = False
-                except Exception:
-                    continue
-                
-                if not has_lifecycle:
+            for bucket, has_policy in zip(buckets, has_lifecycle):
+                # None means the bucket couldn't be checked; skip it
+                if has_policy is False:
                     opportunities.append({
-                        "bucket_name": bucket_name,
+                        "bucket_name": bucket['Name'],
                         "created": bucket['CreationDate'].isoformat(),
-                        "recommendation": "Add lifecycle policy to transition old objects to cheaper storage"
+                        "recommendation": "Add lifecycle policy to transition old objects to cheaper storage",
+                        "estimated_savings": 0.0
                     })
             
             return opportunities
@@ -208,6 +318,16 @@ class AWSClients:
             print(f"Error analyzing S3 buckets: {e}")
             return self._get_mock_s3_opportunities()
     
+    def _has_lifecycle_policy(self, bucket_name: str) -> Optional[bool]:
+        """Whether a bucket has a lifecycle policy, or None if it can't be read."""
+        try:
+            self.s3_client.get_bucket_lifecycle_configuration(Bucket=bucket_name)
+            return True
+        except self.s3_client.exceptions.NoSuchLifecycleConfiguration:
+            return False
+        except Exception:
+            return None
+    
     def _get_mock_cost_data(self) -> Dict[str, Any]:
         """Return mock cost data."""
         return {
@@ -4,7 +4,7 @@ AWS Bedrock client wrapper for LLM inference.
 import os
 import json
 import time
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator
 
 try:
     import boto3
@@ -12,6 +12,29 @@ try:
 except ImportError:
     BOTO3_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Messages API version expected by Claude models on Bedrock
+ANTHROPIC_VERSION = "bedrock-2023-05-31"
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize a request body, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+def _loads(data: bytes) -> Any:
+    """Parse a response body, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class BedrockClient:
     """Client for AWS Bedrock API."""
@@ -19,6 +42,8 @@ class BedrockClient:
     def __init__(self):
         self.region = os.getenv("BEDROCK_REGION", "us-east-1")
         self.default_model = os.getenv("BEDROCK_MODEL", "anthropic.claude-3-sonnet-20240229-v1:0")
+        # Used for short, structured outputs where the large model isn't needed
+        self.small_model = os.getenv("BEDROCK_SMALL_MODEL", "anthropic.claude-3-haiku-20240307-v1:0")
         
         self.client = None
         if BOTO3_AVAILABLE:
@@ -62,30 +87,28 @@ class BedrockClient:
         model_id = model or self.default_model
         
         # Build messages for Claude
-        messages = []
-        full_prompt = prompt
-        
-        if system_prompt:
-            # Claude 3 supports system prompts in the messages array
-            full_prompt = f"{system_prompt}\n\n{prompt}"
-        
-        messages.append({"role": "user", "content": full_prompt})
+        messages = [{"role": "user", "content": prompt}]
         
         try:
             # Prepare request body for Claude 3
-            body = json.dumps({
-                "anthropic_version": "bedrock-2023-05-31",
+            body_dict = {
+                "anthropic_version": ANTHROPIC_VERSION,
                 "max_tokens": max_tokens,
                 "temperature": temperature,
                 "messages": messages
-            })
+            }
+            if system_prompt:
+                # Sent as the static system block rather than folded into
+                # the per-request user text
+                body_dict["system"] = system_prompt
+            body = _dumps(body_dict)
             
             response = self.client.invoke_model(
                 modelId=model_id,
                 body=body
             )
             
-            response_body = json.loads(response['body'].read())
+            response_body = _loads(response['body'].read())
             latency_ms = (time.time() - start_time) * 1000
             
             return {
@@ -98,6 +121,56 @@ class BedrockClient:
         except Exception as e:
             raise Exception(f"Bedrock API error: {str(e)}")
     
+    def stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        model: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        Generate a completion using AWS Bedrock, yielding text as it arrives.
+        
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature
+            model: Model to use (defaults to Claude 3 Sonnet)
+            
+        Yields:
+            Chunks of generated text
+        """
+        if not self.client:
+            raise Exception("Bedrock client not initialized")
+        
+        body_dict = {
+            "anthropic_version": ANTHROPIC_VERSION,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "messages": [{"role": "user", "content": prompt}]
+        }
+        if system_prompt:
+            body_dict["system"] = system_prompt
+        
+        try:
+            response = self.client.invoke_model_with_response_stream(
+                modelId=model or self.default_model,
+                body=_dumps(body_dict)
+            )
+            for event in response['body']:
+                chunk = event.get('chunk')
+                if not chunk:
+                    continue
+                payload = _loads(chunk['bytes'])
+                if payload.get('type') == 'content_block_delta':
+                    text = payload['delta'].get('text')
+                    if text:
+                        yield text
+        except Exception as e:
+            raise Exception(f"Bedrock API error: {str(e)}")
+    
     def chat(
         self,
         messages: List[Dict[str, str]],
@@ -137,25 +210,23 @@ class BedrockClient:
         try:
             # Prepare request body
             body_dict = {
-                "anthropic_version": "bedrock-2023-05-31",
+                "anthropic_version": ANTHROPIC_VERSION,
                 "max_tokens": max_tokens,
                 "temperature": temperature,
                 "messages": user_messages if user_messages else messages
             }
             
             if system_message:
-                # For multi-turn, prepend system to first user message
-                if body_dict["messages"] and body_dict["messages"][0]["role"] == "user":
-                    body_dict["messages"][0]["content"] = f"{system_message}\n\n{body_dict['messages'][0]['content']}"
+                body_dict["system"] = system_message
             
-            body = json.dumps(body_dict)
+            body = _dumps(body_dict)
             
             response = self.client.invoke_model(
                 modelId=model_id,
                 body=body
             )
             
-            response_body = json.loads(response['body'].read())
+            response_body = _loads(response['body'].read())
             latency_ms = (time.time() - start_time) * 1000
             
             return {
@@ -0,0 +1,12 @@
+"""
+Thread pool shared by the backend for overlapping blocking I/O.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+# Covers the widest fan-out (Cost Optimizer's four AWS discovery calls)
+# with room for a second request in flight
+IO_MAX_WORKERS = 8
+
+# Tasks submitted here must not wait on other tasks in this pool, or a
+# full pool would deadlock
+IO_EXECUTOR = ThreadPoolExecutor(max_workers=IO_MAX_WORKERS, thread_name_prefix="nimbus-io")
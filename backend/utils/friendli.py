@@ -3,7 +3,7 @@ Friendli.ai client wrapper for fast LLM inference.
 """
 import os
 import time
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator
 
 try:
     import friendli
@@ -19,6 +19,8 @@ class FriendliClient:
         self.api_key = os.getenv("FRIENDLI_API_KEY") or os.getenv("FRIENDLI_TOKEN")
         self.url = os.getenv("FRIENDLI_URL", "https://api.friendli.ai/v1")
         self.default_model = os.getenv("FRIENDLI_MODEL", "meta-llama-3.1-70b-instruct")
+        # Used for short, structured outputs where the large model isn't needed
+        self.small_model = os.getenv("FRIENDLI_SMALL_MODEL", "meta-llama-3.1-8b-instruct")
         
         self.client = None
         if FRIENDLI_AVAILABLE and self.api_key:
@@ -89,6 +91,51 @@ class FriendliClient:
         except Exception as e:
             raise Exception(f"Friendli API error: {str(e)}")
     
+    def stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        model: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        Generate a completion using Friendli.ai, yielding text as it arrives.
+        
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature
+            model: Model to use (defaults to meta-llama-3.1-70b-instruct)
+            
+        Yields:
+            Chunks of generated text
+        """
+        if not self.client:
+            raise Exception("Friendli client not initialized")
+        
+        # Build messages
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        
+        try:
+            response = friendli.ChatCompletion.create(
+                model=model or self.default_model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                stream=True
+            )
+            for chunk in response:
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+        except Exception as e:
+            raise Exception(f"Friendli API error: {str(e)}")
+    
     def chat(
         self,
         messages: List[Dict[str, str]],
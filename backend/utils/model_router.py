@@ -4,8 +4,8 @@ Measures latency and logs provider usage.
 """
 import os
 import time
-from typing import Optional, List, Dict, Any
-from dataclasses import dataclass
+from typing import Optional, List, Dict, Any, Iterator
+from dataclasses import dataclass, field
 
 from .friendli import FriendliClient
 from .bedrock import BedrockClient
@@ -20,6 +20,7 @@ class LLMResponse:
     model: str
     success: bool = True
     error: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
 
 
 class ModelRouter:
@@ -51,7 +52,8 @@ class ModelRouter:
         max_tokens: int = 1000,
         temperature: float = 0.7,
         model_hint: Optional[str] = None,
-        prefer_provider: Optional[str] = None
+        prefer_provider: Optional[str] = None,
+        prefer_small_model: bool = False
     ) -> LLMResponse:
         """
         Complete a prompt using available LLM provider.
@@ -63,6 +65,8 @@ class ModelRouter:
             temperature: Sampling temperature (0.0-1.0)
             model_hint: Optional model name hint
             prefer_provider: Prefer 'friendli' or 'bedrock' if available
+            prefer_small_model: Use each provider's small model unless
+                model_hint names one; for short, structured outputs
             
         Returns:
             LLMResponse with text, provider, latency, and metadata
@@ -78,7 +82,7 @@ class ModelRouter:
                         system_prompt=system_prompt,
                         max_tokens=max_tokens,
                         temperature=temperature,
-                        model=model_hint
+                        model=self._pick_model(self.friendli, model_hint, prefer_small_model)
                     )
                     self._update_stats("friendli", result["latency_ms"])
                     return LLMResponse(
@@ -95,7 +99,7 @@ class ModelRouter:
                         system_prompt=system_prompt,
                         max_tokens=max_tokens,
                         temperature=temperature,
-                        model=model_hint
+                        model=self._pick_model(self.bedrock, model_hint, prefer_small_model)
                     )
                     self._update_stats("bedrock", result["latency_ms"])
                     return LLMResponse(
@@ -122,6 +126,73 @@ class ModelRouter:
             error=str(last_error) if last_error else "No providers available"
         )
     
+    def llm_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        model_hint: Optional[str] = None,
+        prefer_provider: Optional[str] = None,
+        prefer_small_model: bool = False
+    ) -> Iterator[str]:
+        """
+        Complete a prompt, yielding text as it is generated.
+        
+        The first available provider streams its response token by token.
+        If it fails before producing any text, the llm_complete result is
+        yielded as a single chunk.
+        
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature (0.0-1.0)
+            model_hint: Optional model name hint
+            prefer_provider: Prefer 'friendli' or 'bedrock' if available
+            prefer_small_model: Use each provider's small model unless
+                model_hint names one; for short, structured outputs
+            
+        Yields:
+            Chunks of response text
+        """
+        providers = self._determine_provider_order(prefer_provider)
+        clients = {"friendli": self.friendli, "bedrock": self.bedrock}
+        provider = next((p for p in providers if clients[p].is_available()), None)
+        
+        if provider:
+            client = clients[provider]
+            start_time = time.time()
+            started = False
+            try:
+                for chunk in client.stream(
+                    prompt=prompt,
+                    system_prompt=system_prompt,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    model=self._pick_model(client, model_hint, prefer_small_model)
+                ):
+                    started = True
+                    yield chunk
+                self._update_stats(provider, (time.time() - start_time) * 1000)
+                return
+            except Exception as e:
+                # Text already shown can't be taken back, so only fall back before it starts
+                if started:
+                    raise
+                print(f"Provider {provider} failed: {str(e)}")
+                prefer_provider = next((p for p in providers if p != provider), None)
+        
+        yield self.llm_complete(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            model_hint=model_hint,
+            prefer_provider=prefer_provider,
+            prefer_small_model=prefer_small_model
+        ).text
+    
     def chat(
         self,
         messages: List[Dict[str, str]],
@@ -209,6 +280,13 @@ class ModelRouter:
             # Friendli disabled, use Bedrock only
             return ["bedrock"]
     
+    @staticmethod
+    def _pick_model(client, model_hint: Optional[str], prefer_small_model: bool) -> Optional[str]:
+        """Model to request from client; None means its default model."""
+        if model_hint or not prefer_small_model:
+            return model_hint
+        return client.small_model
+    
     def _update_stats(self, provider: str, latency_ms: float):
         """Update usage statistics."""
         self.stats["call_count"] += 1
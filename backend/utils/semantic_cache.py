@@ -0,0 +1,140 @@
+"""
+Semantic cache for LLM responses, backed by Weaviate.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Callable, Optional, Tuple, TYPE_CHECKING
+
+from .model_router import LLMResponse
+
+if TYPE_CHECKING:
+    from .weaviate_client import WeaviateClient
+
+PROMPT_CACHE_COLLECTION = "PromptCache"
+# Minimum cosine similarity for a cached prompt to count as a match
+SIMILARITY_THRESHOLD = 0.95
+# Max exact-match entries kept in process; least recently used go first
+LOCAL_CACHE_SIZE = 256
+
+
+class SemanticCache:
+    """
+    Return cached LLM responses for repeated or near-repeated prompts.
+
+    Exact repeats are served from an in-process LRU. Other prompts are
+    matched by vector similarity against the PromptCache collection when
+    Weaviate is available.
+    """
+
+    def __init__(
+        self,
+        weaviate_client: Optional['WeaviateClient'] = None,
+        collection_name: str = PROMPT_CACHE_COLLECTION,
+        threshold: float = SIMILARITY_THRESHOLD
+    ):
+        self.weaviate_client = weaviate_client
+        self.collection_name = collection_name
+        self.threshold = threshold
+        # LRU of (scope_key, prompt) -> response; guarded by _local_lock
+        self._local: "OrderedDict[Tuple[str, str], LLMResponse]" = OrderedDict()
+        self._local_lock = threading.Lock()
+
+    def get_or_compute(
+        self,
+        prompt: str,
+        system_prompt: str,
+        compute: Callable[[], LLMResponse],
+        scope: str = ""
+    ) -> LLMResponse:
+        """
+        Return a cached response for prompt, or call compute() and cache it.
+
+        Args:
+            prompt: User prompt sent to the LLM
+            system_prompt: System prompt sent with it
+            compute: Produces the response on a cache miss
+            scope: Anything else the response depends on (generation
+                parameters, hash of the data behind the prompt); entries
+                only match within the same system prompt and scope
+
+        Returns:
+            The cached or freshly computed response
+        """
+        start = time.perf_counter()
+        scope_key = hashlib.sha256(f"{system_prompt}\0{scope}".encode()).hexdigest()
+
+        hit = self._recall(scope_key, prompt) or self._lookup(prompt, scope_key)
+        if hit:
+            self._remember(scope_key, prompt, hit)
+            return replace(
+                hit,
+                latency_ms=(time.perf_counter() - start) * 1000,
+                metadata={"cache_hit": True}
+            )
+
+        response = compute()
+        if response.success:
+            self._remember(scope_key, prompt, response)
+            self._store(prompt, scope_key, response)
+        return response
+
+    def _recall(self, scope_key: str, prompt: str) -> Optional[LLMResponse]:
+        """Return the exact-match entry kept in process, if any."""
+        with self._local_lock:
+            hit = self._local.get((scope_key, prompt))
+            if hit:
+                self._local.move_to_end((scope_key, prompt))
+            return hit
+
+    def _remember(self, scope_key: str, prompt: str, response: LLMResponse):
+        """Keep an exact-match entry in process, evicting the least recently used."""
+        with self._local_lock:
+            self._local[(scope_key, prompt)] = response
+            self._local.move_to_end((scope_key, prompt))
+            while len(self._local) > LOCAL_CACHE_SIZE:
+                self._local.popitem(last=False)
+
+    def _lookup(self, prompt: str, scope_key: str) -> Optional[LLMResponse]:
+        """Find a similar cached prompt in Weaviate."""
+        if not self.weaviate_client or not self.weaviate_client.is_available(self.collection_name):
+            return None
+
+        # Scope is filtered inside the HNSW search, so the nearest neighbour
+        # is the only candidate worth fetching
+        docs = self.weaviate_client.semantic_search(
+            collection_name=self.collection_name,
+            query=prompt,
+            limit=1,
+            properties=["scope", "text", "provider", "model"],
+            filters={"scope": scope_key}
+        )
+        for doc in docs:
+            distance = doc.get("_distance")
+            # Cosine distance is 1 - similarity
+            if doc.get("scope") == scope_key and distance is not None and 1 - distance >= self.threshold:
+                return LLMResponse(
+                    text=doc.get("text", ""),
+                    provider=doc.get("provider", "cache"),
+                    latency_ms=0.0,
+                    model=doc.get("model", "")
+                )
+        return None
+
+    def _store(self, prompt: str, scope_key: str, response: LLMResponse):
+        """Save a response to the PromptCache collection."""
+        if not self.weaviate_client or not self.weaviate_client.is_available(self.collection_name):
+            return
+
+        self.weaviate_client.add_documents(
+            collection_name=self.collection_name,
+            documents=[{
+                "prompt": prompt,
+                "scope": scope_key,
+                "text": response.text,
+                "provider": response.provider,
+                "model": response.model
+            }]
+        )
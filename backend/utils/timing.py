@@ -0,0 +1,16 @@
+"""
+Lightweight per-phase timers for finding where request latency goes.
+"""
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+
+@contextmanager
+def timed(name: str, sink: Dict[str, float]):
+    """Record the elapsed time of the block in milliseconds as sink[name]."""
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        sink[name] = (time.perf_counter_ns() - start) / 1_000_000
@@ -2,6 +2,10 @@
 Weaviate client for semantic search with hybrid search support.
 """
 import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 
 try:
@@ -12,6 +16,22 @@ try:
 except ImportError:
     WEAVIATE_AVAILABLE = False
 
+# Seconds a hybrid_search result stays cached, max cached queries, and max
+# total characters of cached string properties
+SEARCH_CACHE_TTL = 300
+SEARCH_CACHE_SIZE = 256
+SEARCH_CACHE_MAX_CHARS = 4 * 1024 * 1024
+# Seconds searches on a collection skip Weaviate after one on it fails, so
+# an outage doesn't cost a timeout per request
+FAILURE_BACKOFF = 30
+# Length of the content_snippet property stored alongside each document
+SNIPPET_LENGTH = 400
+
+
+def make_snippet(content: str) -> str:
+    """Build the content_snippet property for a document at ingestion time."""
+    return content[:SNIPPET_LENGTH] + "..."
+
 
 class WeaviateClient:
     """Client for Weaviate vector database with hybrid search."""
@@ -20,6 +40,14 @@ class WeaviateClient:
         self.url = os.getenv("WEAVIATE_URL", "http://localhost:8080")
         self.api_key = os.getenv("WEAVIATE_API_KEY")
         self.client = None
+        # LRU of cache_key -> (expiry, results, size); guarded by _search_lock
+        # because hybrid_search_batch searches from several threads
+        self._search_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._search_cache_chars = 0
+        self._search_lock = threading.Lock()
+        # Monotonic time until which searches skip Weaviate, per collection, so
+        # a missing or broken collection doesn't take the others down with it
+        self._down_until: Dict[str, float] = {}
         
         if WEAVIATE_AVAILABLE:
             try:
@@ -57,9 +85,17 @@ class WeaviateClient:
                 print(f"Failed to connect: {e}, {e2}")
                 self.client = None
     
-    def is_available(self) -> bool:
-        """Check if Weaviate client is available."""
-        return self.client is not None
+    def is_available(self, collection_name: Optional[str] = None) -> bool:
+        """
+        Check if Weaviate client is available.
+        
+        Args:
+            collection_name: Also check that searches on this collection
+                aren't backing off after a failure
+        """
+        if self.client is None:
+            return False
+        return collection_name is None or time.monotonic() >= self._down_until.get(collection_name, 0.0)
     
     def create_schema(self, collection_name: str, schema_config: Dict[str, Any]):
         """
@@ -121,6 +157,24 @@ class WeaviateClient:
             print(f"Added {len(documents)} documents to {collection_name}")
         except Exception as e:
             print(f"Error adding documents: {e}")
+        # Cached searches may no longer reflect the collection
+        self.invalidate_search_cache(collection_name)
+    
+    def invalidate_search_cache(self, collection_name: Optional[str] = None):
+        """
+        Drop cached hybrid_search results.
+        
+        Args:
+            collection_name: Only drop results for this collection; all
+                results are dropped when omitted
+        """
+        with self._search_lock:
+            if collection_name is None:
+                self._search_cache.clear()
+                self._search_cache_chars = 0
+                return
+            for cache_key in [k for k in self._search_cache if k[0] == collection_name]:
+                self._evict(cache_key)
     
     def hybrid_search(
         self,
@@ -133,6 +187,10 @@ class WeaviateClient:
         """
         Perform hybrid search (vector + keyword).
         
+        Results are cached per query for SEARCH_CACHE_TTL seconds, evicting
+        least recently used entries past SEARCH_CACHE_SIZE queries or
+        SEARCH_CACHE_MAX_CHARS characters of content.
+        
         Args:
             collection_name: Name of the collection
             query: Search query
@@ -143,60 +201,134 @@ class WeaviateClient:
         Returns:
             List of matching documents
         """
-        if not self.client:
+        if not self.is_available(collection_name):
             return self._get_mock_results(query, limit)
         
-        try:
-            # Try new client API
-            if hasattr(self.client, 'collections'):
-                collection = self.client.collections.get(collection_name)
-                response = collection.query.hybrid(
-                    query=query,
-                    limit=limit,
-                    alpha=alpha,
-                    return_metadata=MetadataQuery(score=True)
-                )
-                
-                results = []
-                for item in response.objects:
-                    results.append({
-                        **item.properties,
-                        "_score": item.metadata.score if item.metadata else None
-                    })
-                return results
-            
-            # Fallback to old API
-            else:
-                props = properties or ["title", "content", "service", "url"]
-                result = (
-                    self.client.query
-                    .get(collection_name, props)
-                    .with_hybrid(query=query, alpha=alpha)
-                    .with_limit(limit)
-                    .with_additional(["score"])
-                    .do()
-                )
-                
-                documents = []
-                if result.get("data", {}).get("Get", {}).get(collection_name):
-                    for item in result["data"]["Get"][collection_name]:
-                        doc = {k: v for k, v in item.items() if k != "_additional"}
-                        if "_additional" in item and "score" in item["_additional"]:
-                            doc["_score"] = item["_additional"]["score"]
-                        documents.append(doc)
-                
-                return documents
+        cache_key = (collection_name, query.lower().strip(), limit, alpha, tuple(properties or ()))
+        with self._search_lock:
+            cached = self._search_cache.get(cache_key)
+            if cached:
+                if cached[0] > time.monotonic():
+                    self._search_cache.move_to_end(cache_key)
+                    return list(cached[1])
+                self._evict(cache_key)
         
+        try:
+            results = self._hybrid_search(collection_name, query, limit, alpha, properties)
         except Exception as e:
             print(f"Hybrid search error: {e}")
+            self._down_until[collection_name] = time.monotonic() + FAILURE_BACKOFF
             return self._get_mock_results(query, limit)
+        
+        size = sum(len(value) for doc in results for value in doc.values() if isinstance(value, str))
+        with self._search_lock:
+            if cache_key in self._search_cache:
+                self._evict(cache_key)
+            self._search_cache[cache_key] = (time.monotonic() + SEARCH_CACHE_TTL, results, size)
+            self._search_cache_chars += size
+            while self._search_cache and (
+                len(self._search_cache) > SEARCH_CACHE_SIZE
+                or self._search_cache_chars > SEARCH_CACHE_MAX_CHARS
+            ):
+                self._evict(next(iter(self._search_cache)))
+        return list(results)
+    
+    def _evict(self, cache_key: tuple):
+        """Drop one search cache entry; caller holds _search_lock."""
+        self._search_cache_chars -= self._search_cache.pop(cache_key)[2]
+    
+    def hybrid_search_batch(
+        self,
+        collection_name: str,
+        queries: List[str],
+        limit: int = 5,
+        alpha: float = 0.5,
+        properties: Optional[List[str]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Run several hybrid searches concurrently.
+        
+        Duplicate queries are searched once.
+        
+        Args:
+            collection_name: Name of the collection
+            queries: Search queries
+            limit: Maximum number of results per query
+            alpha: Balance between vector (1.0) and keyword (0.0) search
+            properties: Properties to return
+            
+        Returns:
+            One result list per query, in the order given
+        """
+        unique_queries = list(dict.fromkeys(queries))
+        if not unique_queries:
+            return []
+        
+        def search(query: str) -> List[Dict[str, Any]]:
+            return self.hybrid_search(collection_name, query, limit, alpha, properties)
+        
+        with ThreadPoolExecutor(max_workers=min(len(unique_queries), 8)) as executor:
+            results = dict(zip(unique_queries, executor.map(search, unique_queries)))
+        
+        return [results[query] for query in queries]
+    
+    def _hybrid_search(
+        self,
+        collection_name: str,
+        query: str,
+        limit: int,
+        alpha: float,
+        properties: Optional[List[str]]
+    ) -> List[Dict[str, Any]]:
+        """Run one hybrid search against Weaviate; raises on failure."""
+        # Try new client API
+        if hasattr(self.client, 'collections'):
+            collection = self.client.collections.get(collection_name)
+            response = collection.query.hybrid(
+                query=query,
+                limit=limit,
+                alpha=alpha,
+                return_properties=properties,
+                return_metadata=MetadataQuery(score=True)
+            )
+            
+            results = []
+            for item in response.objects:
+                results.append({
+                    **item.properties,
+                    "_score": item.metadata.score if item.metadata else None
+                })
+            return results
+        
+        # Fallback to old API
+        else:
+            props = properties or ["title", "content", "service", "url"]
+            result = (
+                self.client.query
+                .get(collection_name, props)
+                .with_hybrid(query=query, alpha=alpha)
+                .with_limit(limit)
+                .with_additional(["score"])
+                .do()
+            )
+            
+            documents = []
+            if result.get("data", {}).get("Get", {}).get(collection_name):
+                for item in result["data"]["Get"][collection_name]:
+                    doc = {k: v for k, v in item.items() if k != "_additional"}
+                    if "_additional" in item and "score" in item["_additional"]:
+                        doc["_score"] = item["_additional"]["score"]
+                    documents.append(doc)
+            
+            return documents
     
     def semantic_search(
         self,
         collection_name: str,
         query: str,
         limit: int = 5,
-        properties: Optional[List[str]] = None
+        properties: Optional[List[str]] = None,
+        filters: Optional[Dict[str, str]] = None
     ) -> List[Dict[str, Any]]:
         """
         Perform semantic (vector) search only.
@@ -206,20 +338,30 @@ class WeaviateClient:
             query: Search query
             limit: Maximum number of results
             properties: Properties to return
+            filters: Text properties the results must equal, applied
+                inside the vector search
             
         Returns:
             List of matching documents
         """
-        if not self.client:
+        if not self.is_available(collection_name):
             return self._get_mock_results(query, limit)
         
         try:
             # Try new client API
             if hasattr(self.client, 'collections'):
                 collection = self.client.collections.get(collection_name)
+                where = None
+                if filters:
+                    where = Filter.all_of([
+                        Filter.by_property(key).equal(value)
+                        for key, value in filters.items()
+                    ])
                 response = collection.query.near_text(
                     query=query,
                     limit=limit,
+                    filters=where,
+                    return_properties=properties,
                     return_metadata=MetadataQuery(distance=True)
                 )
                 
@@ -234,14 +376,22 @@ class WeaviateClient:
             # Fallback to old API
             else:
                 props = properties or ["title", "content", "service", "url"]
-                result = (
+                search = (
                     self.client.query
                     .get(collection_name, props)
                     .with_near_text({"concepts": [query]})
                     .with_limit(limit)
                     .with_additional(["distance"])
-                    .do()
                 )
+                if filters:
+                    search = search.with_where({
+                        "operator": "And",
+                        "operands": [
+                            {"path": [key], "operator": "Equal", "valueText": value}
+                            for key, value in filters.items()
+                        ]
+                    })
+                result = search.do()
                 
                 documents = []
                 if result.get("data", {}).get("Get", {}).get(collection_name):
@@ -255,6 +405,7 @@ class WeaviateClient:
         
         except Exception as e:
             print(f"Semantic search error: {e}")
+            self._down_until[collection_name] = time.monotonic() + FAILURE_BACKOFF
             return self._get_mock_results(query, limit)
     
     def _get_mock_results(self, query: str, limit: int) -> List[Dict[str, Any]]:
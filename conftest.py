@@ -0,0 +1,64 @@
+"""
+Shared pytest fixtures.
+
+Expensive services are built once per session (once per worker under
+pytest-xdist) and reused by every test that asks for them.
+"""
+import functools
+
+import pytest
+
+from src.models.router import ModelRouter
+from src.services.rag_service import RAGService
+from src.services.excalidraw_service import ExcalidrawService
+from src.agents.cost_optimizer import CostOptimizerAgent
+from src.agents.bill_explainer import BillExplainerAgent
+
+
+@pytest.fixture(scope="session")
+def router():
+    """Model router shared across tests."""
+    return ModelRouter()
+
+
+@pytest.fixture(scope="session")
+def rag():
+    """RAG service shared across tests."""
+    return RAGService()
+
+
+@pytest.fixture(scope="session")
+def excal():
+    """Excalidraw service shared across tests."""
+    return ExcalidrawService()
+
+
+@pytest.fixture(scope="session")
+def optimizer(router):
+    """Cost optimizer agent shared across tests."""
+    return CostOptimizerAgent(router)
+
+
+@pytest.fixture(scope="session")
+def explainer(router):
+    """Bill explainer agent shared across tests."""
+    return BillExplainerAgent(router)
+
+
+@pytest.fixture(scope="session")
+def cached_complete(router):
+    """Memoized router.llm_complete for tests that only inspect response shape."""
+    return functools.lru_cache(maxsize=64)(router.llm_complete)
+
+
+@pytest.fixture(scope="session")
+def optimizer_result(optimizer):
+    """Result of a single optimizer.analyze_resources() run."""
+    return optimizer.analyze_resources()
+
+
+@pytest.fixture(scope="session")
+def diagram_and_cfn(excal):
+    """A generated diagram and the CloudFormation converted from it."""
+    diagram = excal.generate_diagram("VPC with Lambda")
+    return diagram, excal.board_to_cfn(diagram)
@@ -13,6 +13,7 @@ load_dotenv()
 from backend.utils.model_router import ModelRouter
 from backend.utils.weaviate_client import WeaviateClient
 from backend.utils.aws_clients import AWSClients
+from backend.utils.semantic_cache import SemanticCache
 from backend.agents.llama.router import LlamaAgentRouter
 from backend.agents.setup_buddy import SetupBuddyAgent
 from backend.agents.bill_explainer import BillExplainerAgent
@@ -75,11 +76,15 @@ if 'weaviate_client' not in st.session_state:
 if 'aws_clients' not in st.session_state:
     st.session_state.aws_clients = AWSClients()
 
+if 'semantic_cache' not in st.session_state:
+    st.session_state.semantic_cache = SemanticCache(st.session_state.weaviate_client)
+
 if 'llama_router' not in st.session_state:
     st.session_state.llama_router = LlamaAgentRouter(
         model_router=st.session_state.model_router,
         weaviate_client=st.session_state.weaviate_client,
-        aws_clients=st.session_state.aws_clients
+        aws_clients=st.session_state.aws_clients,
+        semantic_cache=st.session_state.semantic_cache
     )
 
 
@@ -178,7 +183,8 @@ with tab1:
             # Get response from Setup Buddy
             agent = SetupBuddyAgent(
                 model_router=st.session_state.model_router,
-                weaviate_client=st.session_state.weaviate_client
+                weaviate_client=st.session_state.weaviate_client,
+                semantic_cache=st.session_state.semantic_cache
             )
             response = agent.process(prompt)
             
@@ -243,6 +249,12 @@ with tab2:
                         st.caption(f"🤖 {msg['metadata'].get('agent_display', 'Agent')} • "
                                  f"⚡ {msg['metadata'].get('provider', 'Provider')} • "
                                  f"⏱️ {msg['metadata'].get('latency_ms', 0):.0f}ms")
+                        if msg['metadata'].get('timings'):
+                            with st.expander("⏱️ Timings"):
+                                st.table({
+                                    "phase": list(msg['metadata']['timings']),
+                                    "ms": [f"{ms:.0f}" for ms in msg['metadata']['timings'].values()]
+                                })
         
         # Input
         if prompt := st.chat_input("Ask about your AWS bill..."):
@@ -266,7 +278,8 @@ with tab2:
                 'metadata': {
                     'agent_display': 'Bill Explainer',
                     'provider': response.provider,
-                    'latency_ms': response.latency_ms
+                    'latency_ms': response.latency_ms,
+                    'timings': response.metadata.get('timings', {})
                 }
             })
             
@@ -295,7 +308,8 @@ with tab3:
     # Get savings summary
     optimizer = CostOptimizerAgent(
         model_router=st.session_state.model_router,
-        aws_clients=st.session_state.aws_clients
+        aws_clients=st.session_state.aws_clients,
+        semantic_cache=st.session_state.semantic_cache
     )
     savings = optimizer.get_savings_summary()
     
@@ -414,7 +428,8 @@ with tab4:
             
             agent = DocNavigatorAgent(
                 model_router=st.session_state.model_router,
-                weaviate_client=st.session_state.weaviate_client
+                weaviate_client=st.session_state.weaviate_client,
+                semantic_cache=st.session_state.semantic_cache
             )
             response = agent.process(prompt)
             
@@ -8,7 +8,7 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from backend.utils.weaviate_client import WeaviateClient
+from backend.utils.weaviate_client import WeaviateClient, make_snippet
 
 
 def get_aws_documentation():
@@ -423,6 +423,8 @@ def main():
     print("\n2. Seeding AWSDocs collection...")
     try:
         docs = get_aws_documentation()
+        for doc in docs:
+            doc["content_snippet"] = make_snippet(doc["content"])
         client.add_documents("AWSDocs", docs, batch_size=50)
         print(f"✓ Added {len(docs)} AWS documentation chunks")
     except Exception as e:
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 Initialize Weaviate schema for Nimbus Copilot.
-Creates AWSDocs and CostPatterns collections.
+Creates AWSDocs, CostPatterns and PromptCache collections.
 """
 import sys
 import os
@@ -10,6 +10,7 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from backend.utils.weaviate_client import WeaviateClient
+from backend.utils.semantic_cache import PROMPT_CACHE_COLLECTION
 
 
 def create_aws_docs_schema():
@@ -46,6 +47,16 @@ def create_aws_docs_schema():
                     }
                 }
             },
+            {
+                "name": "content_snippet",
+                "dataType": ["text"],
+                "description": "Truncated content returned in search results",
+                "moduleConfig": {
+                    "text2vec-transformers": {
+                        "skip": True
+                    }
+                }
+            },
             {
                 "name": "service",
                 "dataType": ["text"],
@@ -121,6 +132,89 @@ def create_cost_patterns_schema():
     }
 
 
+def create_prompt_cache_schema():
+    """Create schema for the semantic cache of LLM responses."""
+    return {
+        "class": PROMPT_CACHE_COLLECTION,
+        "description": "Cached LLM responses keyed by prompt similarity",
+        "vectorizer": "text2vec-transformers",
+        "moduleConfig": {
+            "text2vec-transformers": {
+                "poolingStrategy": "masked_mean"
+            }
+        },
+        "vectorIndexType": "hnsw",
+        "vectorIndexConfig": {
+            # SemanticCache compares 1 - distance against a cosine threshold
+            "distance": "cosine",
+            "efConstruction": 200,
+            "maxConnections": 16,
+            # Keep vectors as int8 (scalar quantization); the top candidates
+            # are rescored against the full vectors
+            "sq": {
+                "enabled": True,
+                "rescoreLimit": 20
+            }
+        },
+        "properties": [
+            {
+                "name": "prompt",
+                "dataType": ["text"],
+                "description": "Prompt sent to the LLM",
+                "moduleConfig": {
+                    "text2vec-transformers": {
+                        "skip": False,
+                        "vectorizePropertyName": False
+                    }
+                }
+            },
+            # Only the prompt is vectorized; the rest is payload
+            {
+                "name": "scope",
+                "dataType": ["text"],
+                "description": "Hash of the system prompt and generation settings",
+                # Lookups filter on exact scope
+                "tokenization": "field",
+                "moduleConfig": {
+                    "text2vec-transformers": {
+                        "skip": True
+                    }
+                }
+            },
+            {
+                "name": "text",
+                "dataType": ["text"],
+                "description": "Response text",
+                "moduleConfig": {
+                    "text2vec-transformers": {
+                        "skip": True
+                    }
+                }
+            },
+            {
+                "name": "provider",
+                "dataType": ["text"],
+                "description": "Provider that produced the response",
+                "moduleConfig": {
+                    "text2vec-transformers": {
+                        "skip": True
+                    }
+                }
+            },
+            {
+                "name": "model",
+                "dataType": ["text"],
+                "description": "Model that produced the response",
+                "moduleConfig": {
+                    "text2vec-transformers": {
+                        "skip": True
+                    }
+                }
+            }
+        ]
+    }
+
+
 def main():
     """Initialize Weaviate schema."""
     print("=" * 60)
@@ -159,6 +253,15 @@ def main():
     except Exception as e:
         print(f"⚠ CostPatterns: {e}")
     
+    # Create PromptCache schema
+    print("\n4. Creating PromptCache collection...")
+    try:
+        schema = create_prompt_cache_schema()
+        client.create_schema(PROMPT_CACHE_COLLECTION, schema)
+        print("✓ PromptCache collection created")
+    except Exception as e:
+        print(f"⚠ PromptCache: {e}")
+    
     print("\n" + "=" * 60)
     print("Schema initialization complete!")
     print("=" * 60)
@@ -2,7 +2,7 @@
 Base agent class for Nimbus Copilot agents.
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable
 from src.models.router import ModelRouter, ModelResponse
 
 
@@ -19,8 +19,17 @@ class BaseAgent(ABC):
         pass
     
     @abstractmethod
-    def process(self, user_input: str, context: Optional[Dict[str, Any]] = None) -> ModelResponse:
-        """Process user input and return response."""
+    def process(
+        self,
+        user_input: str,
+        context: Optional[Dict[str, Any]] = None,
+        on_token: Optional[Callable[[str], None]] = None
+    ) -> ModelResponse:
+        """
+        Process user input and return response.
+        
+        If on_token is given, response text is passed to it as it is generated.
+        """
         pass
     
     def format_context(self, context: Optional[Dict[str, Any]]) -> str:
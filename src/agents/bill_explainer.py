@@ -4,7 +4,7 @@ Bill Explainer Agent - Helps users understand their AWS bills.
 import json
 import os
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable
 from src.agents.base import BaseAgent
 from src.models.router import ModelResponse
 
@@ -28,7 +28,12 @@ class BillExplainerAgent(BaseAgent):
 
 Be clear, patient, and thorough. Use analogies when helpful. Focus on making complex billing information accessible."""
     
-    def process(self, user_input: str, context: Optional[Dict[str, Any]] = None) -> ModelResponse:
+    def process(
+        self,
+        user_input: str,
+        context: Optional[Dict[str, Any]] = None,
+        on_token: Optional[Callable[[str], None]] = None
+    ) -> ModelResponse:
         """Process bill-related queries."""
         
         # Load bill data (mock or live)
@@ -50,7 +55,8 @@ Be clear, patient, and thorough. Use analogies when helpful. Focus on making com
             prompt=prompt,
             system_prompt=self.get_system_prompt(),
             max_tokens=1500,
-            temperature=0.6
+            temperature=0.6,
+            on_token=on_token
         )
         
         return response
@@ -3,7 +3,7 @@ Cost Optimizer Agent - Helps users optimize AWS costs.
 """
 import json
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable
 from src.agents.base import BaseAgent
 from src.models.router import ModelResponse
 
@@ -27,7 +27,12 @@ class CostOptimizerAgent(BaseAgent):
 
 Be specific, actionable, and data-driven. Quantify savings whenever possible. Consider both short-term and long-term optimizations."""
     
-    def process(self, user_input: str, context: Optional[Dict[str, Any]] = None) -> ModelResponse:
+    def process(
+        self,
+        user_input: str,
+        context: Optional[Dict[str, Any]] = None,
+        on_token: Optional[Callable[[str], None]] = None
+    ) -> ModelResponse:
         """Process cost optimization queries."""
         
         # Get optimization findings
@@ -46,7 +51,8 @@ Be specific, actionable, and data-driven. Quantify savings whenever possible. Co
             prompt=prompt,
             system_prompt=self.get_system_prompt(),
             max_tokens=1500,
-            temperature=0.6
+            temperature=0.6,
+            on_token=on_token
         )
         
         return response
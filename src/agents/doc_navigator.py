@@ -1,7 +1,7 @@
 """
 Doc Navigator Agent - Helps users find and understand AWS documentation.
 """
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable
 from src.agents.base import BaseAgent
 from src.models.router import ModelResponse
 
@@ -24,7 +24,12 @@ class DocNavigatorAgent(BaseAgent):
 
 Be concise, accurate, and helpful. Always cite the source when referencing documentation."""
     
-    def process(self, user_input: str, context: Optional[Dict[str, Any]] = None) -> ModelResponse:
+    def process(
+        self,
+        user_input: str,
+        context: Optional[Dict[str, Any]] = None,
+        on_token: Optional[Callable[[str], None]] = None
+    ) -> ModelResponse:
         """Process documentation queries with RAG."""
         from src.services.rag_service import format_citations
         
@@ -54,12 +59,16 @@ Be concise, accurate, and helpful. Always cite the source when referencing docum
             prompt=prompt,
             system_prompt=self.get_system_prompt(),
             max_tokens=1500,
-            temperature=0.5
+            temperature=0.5,
+            on_token=on_token
         )
         
         # Append citations to response text if available
         if citations:
-            response.text = response.text + "\n\n### Sources\n\n" + citations
+            sources = "\n\n### Sources\n\n" + citations
+            response.text = response.text + sources
+            if on_token:
+                on_token(sources)
         
         return response
     
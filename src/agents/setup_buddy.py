@@ -1,7 +1,7 @@
 """
 Setup Buddy Agent - Helps users set up AWS infrastructure.
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable
 from src.agents.base import BaseAgent
 from src.models.router import ModelResponse
 
@@ -25,7 +25,12 @@ class SetupBuddyAgent(BaseAgent):
 
 Always be friendly, clear, and practical. Focus on helping users get their infrastructure up and running quickly and correctly."""
     
-    def process(self, user_input: str, context: Optional[Dict[str, Any]] = None) -> ModelResponse:
+    def process(
+        self,
+        user_input: str,
+        context: Optional[Dict[str, Any]] = None,
+        on_token: Optional[Callable[[str], None]] = None
+    ) -> ModelResponse:
         """Process setup-related queries."""
         
         # Add context to the prompt
@@ -38,7 +43,8 @@ Always be friendly, clear, and practical. Focus on helping users get their infra
             prompt=prompt,
             system_prompt=self.get_system_prompt(),
             max_tokens=1500,
-            temperature=0.7
+            temperature=0.7,
+            on_token=on_token
         )
         
         return response
@@ -4,7 +4,7 @@ Model router with Friendli.ai as primary and AWS Bedrock as fallback.
 import os
 import time
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable
 from dataclasses import dataclass
 from src.services.llm_providers import friendli_complete, bedrock_complete
 
@@ -141,7 +141,8 @@ class ModelRouter:
         system_prompt: Optional[str] = None,
         max_tokens: int = 1000,
         temperature: float = 0.7,
-        prefer_provider: Optional[str] = None
+        prefer_provider: Optional[str] = None,
+        on_token: Optional[Callable[[str], None]] = None
     ) -> ModelResponse:
         """
         Generate text using available LLM provider.
@@ -152,6 +153,9 @@ class ModelRouter:
             max_tokens: Maximum tokens to generate
             temperature: Sampling temperature
             prefer_provider: Prefer 'friendli' or 'bedrock' if available
+            on_token: Optional callback receiving text as it is generated.
+                Friendli output is streamed token by token; other providers
+                deliver their full text in one call.
             
         Returns:
             ModelResponse with generated text and metadata
@@ -174,12 +178,19 @@ class ModelRouter:
                 providers = ["bedrock"]
         
         last_error = None
+        started = False
+        
+        def emit(text: str):
+            nonlocal started
+            started = True
+            on_token(text)
         
         for provider in providers:
             try:
                 if provider == "friendli" and self.friendli_client:
                     response = self._generate_friendli(
-                        prompt, system_prompt, max_tokens, temperature
+                        prompt, system_prompt, max_tokens, temperature,
+                        emit if on_token else None
                     )
                     self.stats["friendli_calls"] += 1
                     self.stats["total_latency_ms"] += response.latency_ms
@@ -188,10 +199,15 @@ class ModelRouter:
                     response = self._generate_bedrock(
                         prompt, system_prompt, max_tokens, temperature
                     )
+                    if on_token:
+                        on_token(response.text)
                     self.stats["bedrock_calls"] += 1
                     self.stats["total_latency_ms"] += response.latency_ms
                     return response
             except Exception as e:
+                # Text already streamed can't be taken back, so only fall back before it starts
+                if started:
+                    raise
                 last_error = e
                 logger.warning(f"Provider {provider} failed: {str(e)}")
                 continue
@@ -199,21 +215,25 @@ class ModelRouter:
         # If all providers fail, return mock response
         self.stats["mock_calls"] += 1
         logger.info("All providers failed, returning mock response")
-        return ModelResponse(
+        response = ModelResponse(
             text="I apologize, but I'm unable to connect to the LLM providers at the moment. Please check your API credentials.",
             provider="mock",
             latency_ms=0,
             model="mock"
         )
+        if on_token:
+            on_token(response.text)
+        return response
     
     def _generate_friendli(
         self,
         prompt: str,
         system_prompt: Optional[str],
         max_tokens: int,
-        temperature: float
+        temperature: float,
+        on_token: Optional[Callable[[str], None]] = None
     ) -> ModelResponse:
-        """Generate using Friendli.ai API."""
+        """Generate using Friendli.ai API, streaming tokens to on_token if given."""
         start_time = time.time()
         
         messages = []
@@ -226,13 +246,25 @@ class ModelRouter:
             model="meta-llama-3.1-70b-instruct",
             messages=messages,
             max_tokens=max_tokens,
-            temperature=temperature
+            temperature=temperature,
+            stream=on_token is not None
         )
         
+        if on_token:
+            parts = []
+            for chunk in response:
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    on_token(delta)
+            text = "".join(parts)
+        else:
+            text = response.choices[0].message.content
+        
         latency_ms = (time.time() - start_time) * 1000
         
         return ModelResponse(
-            text=response.choices[0].message.content,
+            text=text,
             provider="friendli",
             latency_ms=round(latency_ms, 2),
             model="meta-llama-3.1-70b-instruct"
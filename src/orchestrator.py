@@ -1,7 +1,11 @@
 """
 Agent orchestrator using LlamaIndex for routing between specialized agents.
 """
-from typing import Dict, Any, Optional
+import asyncio
+import functools
+import queue
+import threading
+from typing import Dict, Any, Optional, Callable, Iterator
 from src.models.router import ModelRouter, ModelResponse
 from src.agents.setup_buddy import SetupBuddyAgent
 from src.agents.doc_navigator import DocNavigatorAgent
@@ -75,7 +79,8 @@ class AgentOrchestrator:
         self,
         query: str,
         context: Optional[Dict[str, Any]] = None,
-        preferred_agent: Optional[str] = None
+        preferred_agent: Optional[str] = None,
+        on_token: Optional[Callable[[str], None]] = None
     ) -> Dict[str, Any]:
         """
         Process a user query through the appropriate agent.
@@ -84,6 +89,7 @@ class AgentOrchestrator:
             query: User query
             context: Optional context information
             preferred_agent: Force using a specific agent
+            on_token: Optional callback receiving response text as it is generated
             
         Returns:
             Dictionary containing response, agent used, and metadata
@@ -98,7 +104,7 @@ class AgentOrchestrator:
         self.current_agent = agent_name
         
         # Process query with selected agent
-        response = agent.process(query, context)
+        response = agent.process(query, context, on_token=on_token)
         
         # Add to conversation history
         self.conversation_history.append({
@@ -119,6 +125,98 @@ class AgentOrchestrator:
             "reasoning": self._generate_reasoning(agent_name, query)
         }
     
+    def process_query_stream(
+        self,
+        query: str,
+        result: Dict[str, Any],
+        context: Optional[Dict[str, Any]] = None,
+        preferred_agent: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        Process a query, yielding response text as it is generated.
+        
+        The query runs on a worker thread. Once the stream is exhausted,
+        ``result`` holds the same dictionary process_query would return.
+        
+        Args:
+            query: User query
+            result: Dictionary filled with the final response and metadata
+            context: Optional context information
+            preferred_agent: Force using a specific agent
+            
+        Yields:
+            Chunks of response text
+        """
+        chunks: queue.Queue = queue.Queue()
+        done = object()
+        errors = []
+        
+        def run():
+            try:
+                result.update(self.process_query(
+                    query,
+                    context=context,
+                    preferred_agent=preferred_agent,
+                    on_token=chunks.put
+                ))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                chunks.put(done)
+        
+        threading.Thread(target=run, daemon=True).start()
+        
+        while (chunk := chunks.get()) is not done:
+            yield chunk
+        
+        if errors:
+            raise errors[0]
+    
+    async def process_query_async(
+        self,
+        query: str,
+        context: Optional[Dict[str, Any]] = None,
+        preferred_agent: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Async variant of process_query for callers running an event loop.
+        
+        Routing runs alongside a speculative RAG prefetch for the query, so
+        when it lands on Doc Navigator the retrieval is already cached.
+        Blocking agent work runs in worker threads.
+        
+        Args:
+            query: User query
+            context: Optional context information
+            preferred_agent: Force using a specific agent
+            
+        Returns:
+            Dictionary containing response, agent used, and metadata
+        """
+        if preferred_agent and preferred_agent in self.agents:
+            agent_name = preferred_agent
+        else:
+            agent_name = None
+        
+        # run_in_executor rather than asyncio.to_thread, which needs Python 3.9
+        loop = asyncio.get_running_loop()
+        tasks = []
+        if agent_name is None:
+            tasks.append(loop.run_in_executor(None, self.route_query, query))
+        if self.rag_service and agent_name in (None, "docs"):
+            # Same arguments as DocNavigatorAgent.process so it hits the search cache
+            tasks.append(loop.run_in_executor(
+                None, functools.partial(self.rag_service.hybrid_search, query, k=3)
+            ))
+        
+        results = await asyncio.gather(*tasks)
+        if agent_name is None:
+            agent_name = results[0]
+        
+        return await loop.run_in_executor(None, functools.partial(
+            self.process_query, query, context=context, preferred_agent=agent_name
+        ))
+    
     def _get_agent_display_name(self, agent_name: str) -> str:
         """Get display-friendly agent name."""
         display_names = {
@@ -8,9 +8,37 @@ from typing import Dict, Any, List
 from datetime import datetime
 import logging
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
+def _dumps_pretty(obj: Any) -> str:
+    """Serialize to indented JSON, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+
+def _dumps_pretty_bytes(obj: Any) -> bytes:
+    """Serialize to indented UTF-8 JSON bytes, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
+
+
+def load_json(path: Path) -> Any:
+    """Parse a JSON file, using orjson when available."""
+    data = Path(path).read_bytes()
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 class ExcalidrawService:
     """Service for generating Excalidraw architecture diagrams."""
     
@@ -190,14 +218,18 @@ class ExcalidrawService:
     
     def export_to_json(self, diagram: Dict[str, Any]) -> str:
         """Export diagram to JSON string."""
-        return json.dumps(diagram, indent=2)
+        return _dumps_pretty(diagram)
+    
+    def export_to_json_bytes(self, diagram: Dict[str, Any]) -> bytes:
+        """Export diagram to UTF-8 JSON bytes, e.g. for a download payload."""
+        return _dumps_pretty_bytes(diagram)
     
     def get_embed_url(self, diagram: Dict[str, Any]) -> str:
         """Get Excalidraw embed URL for the diagram."""
         # Encode diagram as base64 for URL
         import base64
-        diagram_json = json.dumps(diagram)
-        encoded = base64.b64encode(diagram_json.encode()).decode()
+        diagram_json = orjson.dumps(diagram) if ORJSON_AVAILABLE else json.dumps(diagram).encode()
+        encoded = base64.b64encode(diagram_json).decode()
         
         # Return URL to Excalidraw with encoded diagram
         return f"https://excalidraw.com/#json={encoded}"
@@ -232,8 +264,8 @@ class ExcalidrawService:
         
         # Save board JSON
         try:
-            with open(filepath, 'w') as f:
-                json.dump(board, f, indent=2)
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(_dumps_pretty(board))
             
             # Update manifest
             manifest = self._update_manifest(tenant, session, relative_key)
@@ -276,8 +308,7 @@ class ExcalidrawService:
         
         # Load existing manifest or create new
         if manifest_path.exists():
-            with open(manifest_path, 'r') as f:
-                manifest = json.load(f)
+            manifest = load_json(manifest_path)
         else:
             manifest = {"boards": {}}
         
@@ -302,8 +333,8 @@ class ExcalidrawService:
         manifest["boards"][board_key]["latest_key"] = filename
         
         # Save manifest
-        with open(manifest_path, 'w') as f:
-            json.dump(manifest, f, indent=2)
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            f.write(_dumps_pretty(manifest))
         
         return manifest
     
@@ -2,7 +2,8 @@
 RAG (Retrieval Augmented Generation) service using Weaviate.
 """
 import os
-from typing import List, Dict, Any, Optional
+import functools
+from typing import List, Dict, Any, Optional, Tuple
 
 try:
     import weaviate
@@ -10,6 +11,21 @@ try:
 except ImportError:
     WEAVIATE_AVAILABLE = False
 
+# Maximum number of distinct (query, k) results kept per RAGService
+HYBRID_CACHE_SIZE = 128
+
+# Objects per Weaviate import batch (each batch is vectorized server-side in one pass)
+MAX_EMBED_BATCH_SIZE = 2048
+
+
+def get_embed_batch_size() -> int:
+    """Read EMBED_BATCH_SIZE from the environment, clamped to 1..MAX_EMBED_BATCH_SIZE."""
+    try:
+        batch_size = int(os.getenv("EMBED_BATCH_SIZE", "64"))
+    except ValueError:
+        batch_size = 64
+    return max(1, min(batch_size, MAX_EMBED_BATCH_SIZE))
+
 
 class RAGService:
     """Service for document retrieval using Weaviate vector database."""
@@ -17,6 +33,9 @@ class RAGService:
     def __init__(self):
         self.client = None
         self.collection_name = "AWSDocumentation"
+        self._seeded = False
+        # Formatted hybrid_search results keyed on (query, k)
+        self._hybrid_cache: Dict[Tuple[str, int], List[Dict[str, str]]] = {}
         
         if WEAVIATE_AVAILABLE:
             try:
@@ -84,15 +103,22 @@ class RAGService:
         except Exception as e:
             print(f"Error initializing schema: {e}")
     
+    def is_seeded(self) -> bool:
+        """Return True once seed_data has written documents to Weaviate."""
+        return self._seeded
+    
     def seed_data(self, documents: List[Dict[str, Any]]):
-        """Seed the database with initial AWS documentation."""
+        """Seed the database with initial AWS documentation (once per instance)."""
         if not self.client:
             print("Weaviate client not available")
             return
         
+        if self._seeded:
+            return
+        
         try:
             with self.client.batch as batch:
-                batch.batch_size = 100
+                batch.batch_size = get_embed_batch_size()
                 for doc in documents:
                     properties = {
                         "title": doc.get("title", ""),
@@ -104,6 +130,8 @@ class RAGService:
                         properties,
                         self.collection_name
                     )
+            self._seeded = True
+            self._hybrid_cache.clear()
             print(f"Seeded {len(documents)} documents to Weaviate")
         except Exception as e:
             print(f"Error seeding data: {e}")
@@ -149,6 +177,11 @@ class RAGService:
         Returns:
             List of dicts with keys: title, url, snippet
         """
+        cache_key = (query, k)
+        cached = self._hybrid_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+        
         # If WEAVIATE_URL is missing or client unavailable, use curated stubs
         if os.getenv("WEAVIATE_URL", "") == "" or not self.client:
             documents = self._get_mock_results(query, k)
@@ -169,7 +202,11 @@ class RAGService:
                 "snippet": snippet
             })
         
-        return results
+        if len(self._hybrid_cache) >= HYBRID_CACHE_SIZE:
+            self._hybrid_cache.clear()
+        self._hybrid_cache[cache_key] = results
+        
+        return list(results)
     
     def _get_mock_results(self, query: str, limit: int) -> List[Dict[str, Any]]:
         """Return mock results when Weaviate is not available."""
@@ -300,8 +337,9 @@ def get_curated_stubs() -> List[Dict[str, Any]]:
     ]
 
 
+@functools.lru_cache(maxsize=1)
 def get_seed_documents() -> List[Dict[str, Any]]:
-    """Get seed documents for AWS documentation."""
+    """Get seed documents for AWS documentation (built once, treat as read-only)."""
     return [
         {
             "title": "AWS EC2 Overview",
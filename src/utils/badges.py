@@ -0,0 +1,80 @@
+"""
+HTML badge rendering for chat messages.
+
+These helpers live outside app.py because Streamlit re-executes the app
+script on every rerun; module-level tables and caches here persist.
+"""
+import functools
+from html import escape
+
+
+# Agent badge HTML, precomputed once per agent
+_AGENT_BADGE_HTML = {
+    agent: f'<span class="agent-badge {badge_class}">{name}</span>'
+    for agent, (badge_class, name) in {
+        "setup": ("setup-badge", "🛠️ Setup Buddy"),
+        "docs": ("docs-badge", "📚 Doc Navigator"),
+        "bills": ("bills-badge", "💰 Bill Explainer"),
+        "optimize": ("optimize-badge", "📊 Cost Optimizer")
+    }.items()
+}
+
+
+def render_agent_badge(agent_name: str):
+    """Render an agent badge."""
+    html = _AGENT_BADGE_HTML.get(agent_name)
+    if html is None:
+        html = f'<span class="agent-badge">{agent_name}</span>'
+    return html
+
+
+def render_metadata_badges(provider: str, latency_ms: float, mode: str = "Live"):
+    """Render provider, latency, and mode badges."""
+    # Latency is displayed to the millisecond, so round it before the cache lookup
+    return _metadata_badges_html(provider, round(latency_ms), mode)
+
+
+@functools.lru_cache(maxsize=4096)
+def _metadata_badges_html(provider: str, latency_ms: int, mode: str):
+    # Determine mode based on provider
+    if provider.lower() == "mock":
+        mode = "Mock"
+    
+    provider_badge = f'<span class="provider-badge">🔌 {provider}</span>'
+    latency_badge = f'<span class="latency-badge">⚡ {latency_ms}ms</span>'
+    mode_badge = f'<span class="provider-badge">📊 Mode: {mode}</span>'
+    return provider_badge + latency_badge + mode_badge
+
+
+def render_reasoning_trace(reasoning: str):
+    """Render reasoning trace in an expander."""
+    if not reasoning:
+        return ""
+    
+    # Format reasoning as a list if it's a string
+    if isinstance(reasoning, str):
+        reasoning_items = [reasoning]
+    elif isinstance(reasoning, list):
+        reasoning_items = reasoning
+    else:
+        reasoning_items = [str(reasoning)]
+    
+    # Plain text, one line per item; the box preserves line breaks via CSS
+    items_text = "\n".join(f"• {escape(' '.join(str(item).split()))}" for item in reasoning_items)
+    return f'<div class="reasoning-box"><strong>💭 Agent Reasoning:</strong>\n{items_text}</div>'
+
+
+def render_message_meta(agent_name: str, provider: str, latency_ms: float, reasoning, mode: str = "Live"):
+    """
+    Render all metadata for an assistant message as one HTML block.
+    
+    The reasoning trace is wrapped in a <details> element so it stays
+    collapsible without needing a separate expander element.
+    """
+    html = render_agent_badge(agent_name) + render_metadata_badges(provider, latency_ms, mode)
+    
+    reasoning_html = render_reasoning_trace(reasoning)
+    if reasoning_html:
+        html += f'<details><summary>🔍 Show Reasoning</summary>{reasoning_html}</details>'
+    
+    return html
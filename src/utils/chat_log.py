@@ -0,0 +1,45 @@
+"""
+Compact chat history storage for the Streamlit session.
+
+Messages are kept as parallel lists (one per field) rather than a list of
+dicts, so long sessions don't carry a dict per message or a second copy of
+each response.
+"""
+from array import array
+from dataclasses import dataclass, field
+from typing import List
+
+
+@dataclass
+class ChatLog:
+    """Chat history stored as parallel per-field lists."""
+    roles: List[str] = field(default_factory=list)
+    contents: List[str] = field(default_factory=list)
+    agents: List[str] = field(default_factory=list)
+    providers: List[str] = field(default_factory=list)
+    latencies: array = field(default_factory=lambda: array("f"))
+    reasonings: List[str] = field(default_factory=list)
+    # Badge and reasoning HTML, rendered once when the message is added
+    rendered_metas: List[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.roles)
+
+    def append(
+        self,
+        role: str,
+        content: str,
+        agent: str = "",
+        provider: str = "",
+        latency_ms: float = 0.0,
+        reasoning: str = "",
+        rendered_meta: str = ""
+    ):
+        """Add a message to the end of the log."""
+        self.roles.append(role)
+        self.contents.append(content)
+        self.agents.append(agent)
+        self.providers.append(provider)
+        self.latencies.append(latency_ms)
+        self.reasonings.append(reasoning)
+        self.rendered_metas.append(rendered_meta)
@@ -124,6 +124,16 @@ def test_orchestrator():
             print(f"  ✗ '{query}' → {agent} (expected {expected_agent})")
             all_passed = False
     
+    # Async variant routes the same way and prefetches RAG for docs queries
+    import asyncio
+    from src.services.rag_service import RAGService
+    
+    async_orchestrator = AgentOrchestrator(router, RAGService())
+    result = asyncio.run(async_orchestrator.process_query_async("What is EC2?"))
+    assert result["agent"] == "docs", result["agent"]
+    assert result["response"]
+    print(f"  ✓ async 'What is EC2?' → {result['agent']}")
+    
     return all_passed
 
 
@@ -104,6 +104,12 @@ def test_integration():
     response = bills.explain_bill()
     assert response is not None
     print(f"   ✓ Bill Explainer: {response.text[:60]}...")
+    
+    # An account with no spend must not divide by zero
+    for cost_by_service in ({}, {"Amazon Simple Storage Service": 0.0}):
+        breakdown = bills._format_cost_data({"total_cost": 0.0, "cost_by_service": cost_by_service})
+        assert "Total: $0.00" in breakdown
+    print("   ✓ Zero-cost breakdown formatted")
     print()
     
     # Test 5: Cost optimizer
@@ -189,6 +195,23 @@ def test_integration():
     assert 'Resources' in cfn
     print("   ✓ Diagram converter working")
     print(f"   ✓ Generated {len(cfn.get('Resources', {}))} resources")
+    
+    # With two labels in range of one shape, the closer one wins
+    crowded_diagram = {
+        "type": "excalidraw",
+        "elements": [
+            {"id": "1", "type": "rectangle", "x": 100, "y": 100},
+            {"id": "2", "type": "text", "x": 180, "y": 100, "text": "Far Label"},
+            {"id": "3", "type": "text", "x": 110, "y": 105, "text": "Near Label"}
+        ]
+    }
+    cfn = converter.convert(crowded_diagram)
+    labels = [r['Metadata']['DiagramLabel'] for r in cfn['Resources'].values()]
+    assert labels == ["near label"], labels
+    
+    text_index = converter._build_text_index(crowded_diagram["elements"][1:])
+    assert converter._find_nearby_text(100, 100, text_index, threshold=0) is None
+    print("   ✓ Closest label chosen")
     print()
     
     print("=" * 60)
@@ -9,6 +9,7 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from src.models.router import ModelRouter
+from backend.utils.model_router import ModelRouter as BackendModelRouter
 
 
 def test_router_initialization():
@@ -91,6 +92,89 @@ def test_prefer_provider():
     print(f"  Actual: {response.provider}\n")
 
 
+def test_no_fallback_after_partial_stream():
+    """Test that a stream failing midway is not followed by a fallback answer."""
+    print("Test: No Fallback After Partial Stream")
+    
+    router = ModelRouter()
+    router.friendli_client = object()
+    router.bedrock_client = None
+    
+    def failing_friendli(prompt, system_prompt, max_tokens, temperature, on_token=None):
+        on_token("Partial ")
+        raise RuntimeError("stream dropped")
+    
+    router._generate_friendli = failing_friendli
+    
+    tokens = []
+    try:
+        router.generate("Test prompt", prefer_provider="friendli", on_token=tokens.append)
+        raised = False
+    except RuntimeError:
+        raised = True
+    
+    assert raised
+    assert tokens == ["Partial "]
+    assert router.stats["mock_calls"] == 0
+    print("✓ Partial stream re-raised without a second answer\n")
+
+
+def _streaming_router(stream):
+    """Backend router whose Friendli stream is `stream` and whose Bedrock answers in one call."""
+    router = BackendModelRouter()
+    router.use_friendli = True
+    router.friendli.client = object()
+    router.friendli.stream = stream
+    router.bedrock.client = object()
+    router.bedrock_calls = []
+    
+    def bedrock_complete(**kwargs):
+        router.bedrock_calls.append(kwargs)
+        return {"text": "Bedrock answer", "latency_ms": 1.0, "model": "claude", "provider": "AWS Bedrock"}
+    
+    router.bedrock.complete = bedrock_complete
+    return router
+
+
+def test_llm_stream_falls_back_before_first_token():
+    """Test that a stream failing before any text falls back to the next provider."""
+    print("Test: llm_stream Fallback Before First Token")
+    
+    def failing_stream(**kwargs):
+        raise RuntimeError("connection refused")
+        yield
+    
+    router = _streaming_router(failing_stream)
+    chunks = list(router.llm_stream("Test prompt"))
+    
+    assert chunks == ["Bedrock answer"]
+    assert len(router.bedrock_calls) == 1
+    print("✓ Fell back to Bedrock before any text was shown\n")
+
+
+def test_llm_stream_no_fallback_after_first_token():
+    """Test that a stream failing midway re-raises instead of falling back."""
+    print("Test: llm_stream No Fallback After First Token")
+    
+    def dropping_stream(**kwargs):
+        yield "Partial "
+        raise RuntimeError("stream dropped")
+    
+    router = _streaming_router(dropping_stream)
+    chunks = []
+    try:
+        for chunk in router.llm_stream("Test prompt"):
+            chunks.append(chunk)
+        raised = False
+    except RuntimeError:
+        raised = True
+    
+    assert raised
+    assert chunks == ["Partial "]
+    assert router.bedrock_calls == []
+    print("✓ Partial stream re-raised without a second answer\n")
+
+
 def main():
     """Run all tests."""
     print("=" * 60)
@@ -102,7 +186,10 @@ def main():
         test_router_initialization,
         test_fallback_to_mock,
         test_stats_tracking,
-        test_prefer_provider
+        test_prefer_provider,
+        test_no_fallback_after_partial_stream,
+        test_llm_stream_falls_back_before_first_token,
+        test_llm_stream_no_fallback_after_first_token
     ]
     
     passed = 0
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Test WeaviateClient search caching and failure backoff.
+"""
+import sys
+import os
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.utils import weaviate_client
+from backend.utils.weaviate_client import WeaviateClient
+
+
+class FakeSearch:
+    """Query builder standing in for the legacy (v3) Weaviate client."""
+    
+    def __init__(self, weaviate, collection_name):
+        self.weaviate = weaviate
+        self.collection_name = collection_name
+        self.query = None
+    
+    def with_hybrid(self, query, alpha):
+        self.query = query
+        return self
+    
+    def with_near_text(self, content):
+        self.query = content["concepts"][0]
+        return self
+    
+    def with_limit(self, limit):
+        return self
+    
+    def with_additional(self, fields):
+        return self
+    
+    def with_where(self, where):
+        return self
+    
+    def do(self):
+        time.sleep(self.weaviate.delays.get(self.query, 0))
+        self.weaviate.calls.append((self.collection_name, self.query))
+        if self.collection_name in self.weaviate.failing:
+            raise RuntimeError(f"class {self.collection_name} not found")
+        return {"data": {"Get": {self.collection_name: [
+            {"title": f"{self.query} doc", "content": "x" * self.weaviate.content_size}
+        ]}}}
+
+
+class FakeBatch:
+    """Batch context manager standing in for the legacy (v3) Weaviate client."""
+    
+    def __init__(self, weaviate):
+        self.weaviate = weaviate
+        self.batch_size = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+    
+    def add_data_object(self, data_object, class_name):
+        self.weaviate.added.append((class_name, data_object))
+
+
+class FakeWeaviate:
+    """Records searches, failing those on the given collections and delaying the given queries."""
+    
+    def __init__(self, failing=(), content_size=10, delays=None):
+        self.failing = set(failing)
+        self.content_size = content_size
+        self.delays = delays or {}
+        self.calls = []
+        self.added = []
+        self.query = self
+        self.batch = FakeBatch(self)
+    
+    def get(self, collection_name, props):
+        return FakeSearch(self, collection_name)
+
+
+def make_client(failing=(), content_size=10, delays=None):
+    """WeaviateClient backed by a FakeWeaviate."""
+    client = WeaviateClient()
+    client.client = FakeWeaviate(failing, content_size, delays)
+    return client
+
+
+def test_failure_backoff_is_per_collection():
+    """Test that a failing collection doesn't block searches on another."""
+    print("Test: Per-Collection Failure Backoff")
+    
+    client = make_client(failing={"PromptCache"})
+    
+    client.semantic_search("PromptCache", "cached prompt", limit=1)
+    assert not client.is_available("PromptCache")
+    assert client.is_available("AWSDocs")
+    assert client.is_available()
+    
+    results = client.hybrid_search("AWSDocs", "lambda pricing", limit=1)
+    assert results[0]["title"] == "lambda pricing doc"
+    assert ("AWSDocs", "lambda pricing") in client.client.calls
+    
+    # The failing collection is skipped while backing off
+    calls = len(client.client.calls)
+    client.semantic_search("PromptCache", "cached prompt", limit=1)
+    assert len(client.client.calls) == calls
+    print("✓ PromptCache failure left AWSDocs search working\n")
+
+
+def test_hybrid_search_batch():
+    """Test that batched searches dedupe, keep query order and use the cache."""
+    print("Test: Hybrid Search Batch")
+    
+    # The first query finishes last, so results can't come back in completion order
+    client = make_client(delays={"lambda": 0.05})
+    client.hybrid_search("AWSDocs", "s3", limit=3)
+    calls = len(client.client.calls)
+    
+    results = client.hybrid_search_batch("AWSDocs", ["lambda", "s3", "lambda", "ec2"], limit=3)
+    
+    assert [docs[0]["title"] for docs in results] == ["lambda doc", "s3 doc", "lambda doc", "ec2 doc"]
+    # "lambda" is searched once and "s3" comes from the cache
+    assert sorted(client.client.calls[calls:]) == [("AWSDocs", "ec2"), ("AWSDocs", "lambda")]
+    assert client.hybrid_search_batch("AWSDocs", []) == []
+    print("✓ Duplicates searched once, order kept, cached query skipped\n")
+
+
+def test_search_cache_lru_order():
+    """Test that the search cache evicts the least recently used query."""
+    print("Test: Search Cache LRU Order")
+    
+    original_size = weaviate_client.SEARCH_CACHE_SIZE
+    weaviate_client.SEARCH_CACHE_SIZE = 3
+    try:
+        client = make_client()
+        for query in ("a", "b", "c", "a", "d"):
+            client.hybrid_search("AWSDocs", query)
+        assert len(client.client.calls) == 4
+        
+        # "b" was the least recently used when "d" arrived; the rest survive
+        for query in ("c", "a", "d"):
+            client.hybrid_search("AWSDocs", query)
+        assert len(client.client.calls) == 4
+        client.hybrid_search("AWSDocs", "b")
+        assert len(client.client.calls) == 5
+    finally:
+        weaviate_client.SEARCH_CACHE_SIZE = original_size
+    print("✓ Least recently used query evicted first\n")
+
+
+def test_search_cache_ttl():
+    """Test that cached results expire after SEARCH_CACHE_TTL seconds."""
+    print("Test: Search Cache TTL")
+    
+    original_ttl = weaviate_client.SEARCH_CACHE_TTL
+    weaviate_client.SEARCH_CACHE_TTL = 0.05
+    try:
+        client = make_client()
+        client.hybrid_search("AWSDocs", "s3")
+        client.hybrid_search("AWSDocs", "s3")
+        assert len(client.client.calls) == 1
+        
+        time.sleep(0.1)
+        client.hybrid_search("AWSDocs", "s3")
+        assert len(client.client.calls) == 2
+        # The expired entry was replaced, not kept alongside the new one
+        assert len(client._search_cache) == 1
+    finally:
+        weaviate_client.SEARCH_CACHE_TTL = original_ttl
+    print("✓ Expired result fetched again\n")
+
+
+def test_search_cache_char_bound():
+    """Test that cached content stays within SEARCH_CACHE_MAX_CHARS."""
+    print("Test: Search Cache Character Bound")
+    
+    # Three results of 1.5M characters each overflow the 4M budget
+    client = make_client(content_size=1_500_000)
+    for query in ("a", "b", "c"):
+        client.hybrid_search("AWSDocs", query)
+    
+    assert client._search_cache_chars <= weaviate_client.SEARCH_CACHE_MAX_CHARS
+    assert len(client._search_cache) == 2
+    client.hybrid_search("AWSDocs", "a")
+    assert len(client.client.calls) == 4
+    print(f"✓ Oldest result evicted; {client._search_cache_chars:,} characters cached\n")
+
+
+def test_add_documents_invalidates_cache():
+    """Test that adding documents drops cached searches on that collection."""
+    print("Test: add_documents Invalidates Cache")
+    
+    client = make_client()
+    client.hybrid_search("AWSDocs", "s3")
+    client.hybrid_search("OtherDocs", "s3")
+    
+    client.add_documents("AWSDocs", [{"title": "New S3 doc"}])
+    assert client.client.added == [("AWSDocs", {"title": "New S3 doc"})]
+    
+    client.hybrid_search("AWSDocs", "s3")
+    client.hybrid_search("OtherDocs", "s3")
+    assert client.client.calls.count(("AWSDocs", "s3")) == 2
+    assert client.client.calls.count(("OtherDocs", "s3")) == 1
+    
+    client.invalidate_search_cache()
+    assert not client._search_cache and client._search_cache_chars == 0
+    print("✓ Only the updated collection's searches were dropped\n")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Weaviate Client Tests")
+    print("=" * 60)
+    print()
+    
+    tests = [
+        test_failure_backoff_is_per_collection,
+        test_hybrid_search_batch,
+        test_search_cache_lru_order,
+        test_search_cache_ttl,
+        test_search_cache_char_bound,
+        test_add_documents_invalidates_cache
+    ]
+    
+    passed = 0
+    failed = 0
+    
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ Test failed: {e}\n")
+            failed += 1
+        except Exception as e:
+            print(f"✗ Test error: {e}\n")
+            failed += 1
+    
+    print("=" * 60)
+    print(f"Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+    
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())